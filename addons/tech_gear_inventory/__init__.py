@@ -1,2 +1,3 @@
 # tech_gear_inventory/__init__.py
+from . import controllers
 from . import models
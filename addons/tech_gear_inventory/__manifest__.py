@@ -12,10 +12,14 @@
     'depends': ['product'],
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/excel_import_wizard_view.xml',
         'views/excel_import_wizard_error_dialog.xml',
+        'views/excel_export_wizard_view.xml',
         'views/product_category_view.xml',
         'views/product_template_view.xml',
+        'views/import_job_view.xml',
+        'views/import_log_view.xml',
         'views/menu.xml',
     ],
     'installable': True,
@@ -0,0 +1,2 @@
+# tech_gear_inventory/controllers/__init__.py
+from . import main
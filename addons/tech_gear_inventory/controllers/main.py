@@ -0,0 +1,35 @@
+# tech_gear_inventory/controllers/main.py
+import os
+import tempfile
+from werkzeug.wsgi import wrap_file
+from odoo import http
+from odoo.http import Response, content_disposition, request
+
+
+class ExcelExportController(http.Controller):
+
+    @http.route('/tech_gear_inventory/export/<int:wizard_id>', type='http', auth='user')
+    def download_export(self, wizard_id):
+        """
+        Write the export of a wizard to a temporary file and stream it to the browser. Neither the raw nor
+        the base64-encoded workbook is held in memory, the file is closed and deleted once it is sent.
+        """
+        wizard = request.env['tech.gear.excel.export.wizard'].browse(wizard_id).exists()
+        if not wizard:
+            raise request.not_found()
+
+        file = tempfile.TemporaryFile(suffix='.xlsx')
+        try:
+            wizard.product_count = wizard._write_workbook(file)
+            size = file.seek(0, os.SEEK_END)
+            file.seek(0)
+        except Exception:
+            file.close()
+            raise
+
+        headers = [
+            ('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+            ('Content-Disposition', content_disposition(wizard.filename)),
+            ('Content-Length', size),
+        ]
+        return Response(wrap_file(request.httprequest.environ, file), headers=headers, direct_passthrough=True)
@@ -2,3 +2,6 @@
 from . import product_template
 from . import product_category
 from . import excel_import_wizard
+from . import excel_export_wizard
+from . import import_job
+from . import import_log
@@ -0,0 +1,79 @@
+# tech_gear_inventory/models/excel_export_wizard.py
+import openpyxl
+from odoo import models, fields, _
+
+# Header of the exported sheet, the layout read by the Excel import
+SHEET_HEADER = ('Product Name', 'Category', 'Price', 'Quantity')
+
+
+class ExcelExportWizard(models.TransientModel):
+    # Exports products in the layout of the Excel import, so that catalogs can be round-tripped.
+    # Products are read in id-ordered pages and written through a write-only workbook which streams rows
+    # to disk, and the file is streamed to the browser by the export route, so memory stays flat whatever
+    # the size of the catalog.
+
+    _name = 'tech.gear.excel.export.wizard'
+    _description = 'Excel Export Wizard for Tech Gear Inventory'
+
+    category_ids = fields.Many2many('product.category', string="Categories",
+                                    help="Only export products of these categories, all products when empty")
+    batch_size = fields.Integer("Batch Size", default=1000, help="Number of products read per query")
+    filename = fields.Char("Filename", readonly=True, default="products.xlsx")
+    product_count = fields.Integer("Exported Products", readonly=True)
+
+    def action_export(self):
+        """
+        Download the products in the import layout. The workbook is written and streamed by the export route,
+        storing it on the wizard would load it in memory, base64-encoded.
+        """
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/tech_gear_inventory/export/{self.id}',
+            'target': 'self',
+        }
+
+    def _write_workbook(self, file):
+        """
+        Stream the products into a write-only workbook saved to the given file object.
+        :return: Number of exported products
+        """
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(_("Products"))
+        sheet.append(SHEET_HEADER)
+
+        # The import matches categories on their name, not on the full path returned for categ_id
+        category_names = {}
+        product_count = 0
+        for records in self._iter_product_pages():
+            missing = {record['categ_id'][0] for record in records} - category_names.keys()
+            if missing:
+                for category in self.env['product.category'].search_read([('id', 'in', list(missing))], ['name']):
+                    category_names[category['id']] = category['name']
+            for record in records:
+                sheet.append((record['name'], category_names[record['categ_id'][0]],
+                              record['price'], record['quantity']))
+            product_count += len(records)
+
+        workbook.save(file)
+        return product_count
+
+    def _iter_product_pages(self):
+        """
+        Read the products page by page. Pages continue after the last id instead of using an offset, so
+        every page is an index range scan, and the ORM cache is dropped between pages. Names are read in en_US,
+        the language the import matches product names in.
+        """
+        domain = [('categ_id', 'in', self.category_ids.ids)] if self.category_ids else []
+        last_id = 0
+        while True:
+            records = self.env['product.template'].with_context(lang='en_US').search_read(
+                domain + [('id', '>', last_id)],
+                ['name', 'categ_id', 'price', 'quantity'],
+                order='id',
+                limit=max(self.batch_size, 1),
+            )
+            if not records:
+                return
+            yield records
+            last_id = records[-1]['id']
+            self.env.invalidate_all()
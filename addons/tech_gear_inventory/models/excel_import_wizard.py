@@ -1,14 +1,158 @@
 # tech_gear_inventory/models/excel_import_wizard.py
 import base64
+import copy
+import gzip
+import hashlib
+import logging
+import multiprocessing
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from io import BytesIO
+from itertools import islice
 import openpyxl
-from odoo import models, fields, _
-from odoo.exceptions import ValidationError
+from openpyxl.worksheet._reader import WorkSheetParser
+from odoo import Command, api, models, fields, _, _lt
+from odoo.exceptions import AccessError, ValidationError
+from odoo.tools import SQL
+from .product_category import shared_category_cache
+
+try:
+    import resource
+except ImportError:  # Not available on Windows, adaptive chunk sizing then ignores memory
+    resource = None
+
+_logger = logging.getLogger(__name__)
+
+# Size of the blocks copied or base64-decoded at once when spooling an upload, must be a multiple of 4
+DECODE_BLOCK_SIZE = 4 * 1024 * 1024
+# System parameter holding the fingerprint of the last successful import
+IMPORT_FINGERPRINT_PARAM = 'tech_gear_inventory.last_import_fingerprint'
+# System parameter capping the number of parsing processes of an import, the CPU count when not set
+MAX_PARSE_WORKERS_PARAM = 'tech_gear_inventory.max_parse_workers'
+# Approximate size of the worksheet XML segments handed to parsing processes
+PARSE_SEGMENT_SIZE = 1024 * 1024
+# Number of sheet rows read and validated at once by the sequential parser
+VALIDATION_BLOCK_SIZE = 1000
+# Accepted types of the price and quantity cells
+NUMERIC_TYPES = (int, float)
+
+SHEET_DATA_PATTERN = re.compile(rb'<sheetData\s*>')
+WORKSHEET_TAG_PATTERN = re.compile(rb'<worksheet\b[^>]*>')
+ROW_START_PATTERN = re.compile(rb'<row[\s/>]')
+
+# Error types of the aggregated error log, in the order of the error summary
+ERROR_TYPES = {
+    'missing_data': _lt("Missing product name or category"),
+    'invalid_price': _lt("Invalid price"),
+    'invalid_quantity': _lt("Invalid quantity"),
+    'create_failed': _lt("Product creation failed"),
+    'update_failed': _lt("Product update failed"),
+    'other': _lt("Other errors"),
+}
+
+
+class ErrorMessage(str):
+    """Error log line which also carries its error type and row, so the error log can aggregate it."""
+
+    def __new__(cls, message, error_type='other', row_index=None):
+        self = super().__new__(cls, message)
+        self.error_type = error_type
+        self.row_index = row_index
+        return self
+
+
+class ErrorLimitReached(Exception):
+    """Raised by the error log once the maximum number of errors of an import is reached."""
+
+
+class ErrorLog:
+    """
+    Error log of an import run. Lines are streamed gzip-compressed to a temporary file as they are reported
+    and aggregated by error type with a count and sample rows, so memory does not grow with the error count.
+    """
+
+    # Number of sample rows kept per error type
+    SAMPLE_ROWS = 10
+
+    def __init__(self, max_errors=0, groups=None):
+        """
+        :param max_errors: Stop the import by raising ErrorLimitReached once this many errors are logged,
+            0 never stops
+        :param groups: Aggregated groups of a previous run to continue, as returned by the groups attribute
+        """
+        self.max_errors = max_errors
+        self.groups = copy.deepcopy(groups) if groups else {}  # Error type to its count, sample rows and example
+        self.count = 0
+        self.limit_reached = False
+        self._file = None
+        self._stream = None
+
+    def __len__(self):
+        return self.count
+
+    def append(self, message):
+        if self._stream is None:
+            self._file = tempfile.TemporaryFile()
+            self._stream = gzip.GzipFile(fileobj=self._file, mode='wb')
+        self._stream.write(message.encode('utf-8') + b"\n")
+        self.count += 1
+
+        error_type = getattr(message, 'error_type', 'other')
+        group = self.groups.setdefault(error_type, {'count': 0, 'rows': [], 'example': str(message)})
+        group['count'] += 1
+        row_index = getattr(message, 'row_index', None)
+        if row_index and len(group['rows']) < self.SAMPLE_ROWS and row_index not in group['rows']:
+            group['rows'].append(row_index)
+
+        if self.max_errors and self.count >= self.max_errors:
+            self.limit_reached = True
+            raise ErrorLimitReached(_("Import stopped after reaching the maximum of %d errors.", self.max_errors))
+
+    def extend(self, messages):
+        for message in messages:
+            self.append(message)
+
+    def summary(self):
+        """Human readable summary of the errors, one paragraph per error type with its count and sample rows."""
+        paragraphs = []
+        if self.limit_reached:
+            paragraphs.append(_("Import stopped after reaching the maximum of %d errors.", self.max_errors))
+        for error_type, label in ERROR_TYPES.items():
+            group = self.groups.get(error_type)
+            if not group:
+                continue
+            rows = ", ".join(str(row_index) for row_index in group['rows'])
+            if group['count'] > len(group['rows']):
+                rows += ", ..."
+            paragraphs.append(_("%(label)s: %(count)d (rows %(rows)s)\n    e.g. %(example)s",
+                                label=label, count=group['count'], rows=rows or "-", example=group['example']))
+        return "\n".join(paragraphs)
+
+    def compressed(self):
+        """Close the log and return its lines as gzip-compressed bytes."""
+        if self._stream is None:
+            return b''
+        self._stream.close()
+        self._file.seek(0)
+        data = self._file.read()
+        self._file.close()
+        self._stream = self._file = None
+        return data
 
 
 class ProductData:
     """Encapsulates data and validation logic for a single row in the Excel file."""
 
+    # No per-instance __dict__, a row costs a fraction of the memory and allocation time
+    __slots__ = ('product_name', 'category_name', 'price', 'quantity', 'row_index', 'is_valid')
+
     def __init__(self, product_name, category_name, price, quantity, row_index):
         self.product_name = product_name
         self.category_name = category_name
@@ -22,29 +166,373 @@ class ProductData:
         Validate row data and log errors if necessary.
         This method updates the is_valid attribute based on validation outcome.
         """
-        self.is_valid = True  # Start by assuming the row is valid
+        missing = not self.product_name or not self.category_name
+        invalid_price = not isinstance(self.price, NUMERIC_TYPES)
+        invalid_quantity = not isinstance(self.quantity, NUMERIC_TYPES)
+        self.is_valid = not (missing or invalid_price or invalid_quantity)
+        if not self.is_valid:
+            self._log_errors(error_log, self.row_index, self.price, self.quantity,
+                             missing, invalid_price, invalid_quantity)
+        return self.is_valid
 
-        if not self.product_name or not self.category_name:
-            error_log.append(_("Row %d: Missing 'Product Name' or 'Category'.") % self.row_index)
-            self.is_valid = False
+    @classmethod
+    def validate_rows(cls, rows, row_indexes, error_log):
+        """
+        Validate a block of raw sheet rows column by column and build instances of the valid rows only.
+        Each check runs over a whole column, rows are only looked at one by one when they failed a check,
+        and their errors are reported in sheet order like with validate.
+        :param rows: List of (product name, category, price, quantity) tuples
+        :param row_indexes: Sheet row number of every row
+        :return: List of the valid rows as ProductData instances
+        """
+        if not rows:
+            return []
+        names, categories, prices, quantities = zip(*rows)
+        missing = [not name or not category for name, category in zip(names, categories)]
+        invalid_prices = [not isinstance(price, NUMERIC_TYPES) for price in prices]
+        invalid_quantities = [not isinstance(quantity, NUMERIC_TYPES) for quantity in quantities]
+        invalid = [any(checks) for checks in zip(missing, invalid_prices, invalid_quantities)]
 
-        if not isinstance(self.price, (int, float)):
-            error_log.append(_("Row %d: Invalid price '%s' - must be numeric.") % (self.row_index, self.price))
-            self.is_valid = False
+        if any(invalid):
+            for index in (index for index, is_invalid in enumerate(invalid) if is_invalid):
+                cls._log_errors(error_log, row_indexes[index], prices[index], quantities[index],
+                                missing[index], invalid_prices[index], invalid_quantities[index])
+        return [
+            cls(*row, row_index)
+            for row, row_index, is_invalid in zip(rows, row_indexes, invalid) if not is_invalid
+        ]
 
-        if not isinstance(self.quantity, (int, float)):
-            error_log.append(_("Row %d: Invalid quantity '%s' - must be numeric.") % (self.row_index, self.quantity))
-            self.is_valid = False
+    @staticmethod
+    def _log_errors(error_log, row_index, price, quantity, missing, invalid_price, invalid_quantity):
+        if missing:
+            error_log.append(ErrorMessage(_("Row %d: Missing 'Product Name' or 'Category'.") % row_index,
+                                          'missing_data', row_index))
+        if invalid_price:
+            error_log.append(ErrorMessage(_("Row %d: Invalid price '%s' - must be numeric.") % (
+                row_index, price), 'invalid_price', row_index))
+        if invalid_quantity:
+            error_log.append(ErrorMessage(_("Row %d: Invalid quantity '%s' - must be numeric.") % (
+                row_index, quantity), 'invalid_quantity', row_index))
 
-        return self.is_valid
+    def content_hash(self):
+        """
+        Fingerprint of the imported content of a valid row, used to detect rows that did not change.
+        Price and quantity are normalised the way they are stored, so 100 and 100.0 hash the same.
+        """
+        content = "\x1f".join((str(self.product_name), str(self.category_name),
+                                repr(float(self.price)), str(int(self.quantity))))
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def iter_sheet_segments(source, segment_size=PARSE_SEGMENT_SIZE):
+    """
+    Split a worksheet XML stream into segments made of whole <row> elements, so they can be parsed independently.
+    The first item yielded is the <worksheet> start tag, which carries the namespaces needed to parse a segment.
+    Raises ValueError for layouts which cannot be split (e.g. prefixed tags) so callers can parse sequentially.
+    """
+    buffer = b''
+    worksheet_tag = None
+    end_of_file = False
+    while not end_of_file:
+        block = source.read(segment_size)
+        end_of_file = not block
+        buffer += block
+
+        if worksheet_tag is None:
+            sheet_data = SHEET_DATA_PATTERN.search(buffer)
+            if not sheet_data:
+                if end_of_file:
+                    raise ValueError("Worksheet has no splittable sheet data")
+                continue
+            worksheet = WORKSHEET_TAG_PATTERN.search(buffer, 0, sheet_data.start())
+            if not worksheet:
+                raise ValueError("Worksheet root element not found")
+            worksheet_tag = worksheet.group(0)
+            yield worksheet_tag
+            buffer = buffer[sheet_data.end():]
+
+        end = buffer.rfind(b'</row>')
+        if end >= 0:
+            end += len(b'</row>')
+            yield buffer[:end]
+            buffer = buffer[end:]
+
+
+# Workbook level data shared with every parsing process, set by the pool initializer
+_parse_worker_state = {}
+
+
+def _init_parse_worker(shared_strings, epoch, date_formats, timedelta_formats):
+    _parse_worker_state.update(
+        shared_strings=shared_strings,
+        epoch=epoch,
+        date_formats=date_formats,
+        timedelta_formats=timedelta_formats,
+    )
+
+
+def _parse_sheet_segment(worksheet_tag, segment, first_row, min_row):
+    """
+    Parse and validate a worksheet segment in a parsing process with openpyxl's own worksheet parser.
+    :param first_row: Row number of the first row of the segment, used when rows carry no explicit number
+    :return: Tuple of the valid rows as columns (names, categories, prices, quantities, row indexes), the
+        error messages and the number of non-blank rows read
+    """
+    parser = WorkSheetParser(
+        BytesIO(worksheet_tag + b'<sheetData>' + segment + b'</sheetData></worksheet>'),
+        _parse_worker_state['shared_strings'],
+        data_only=True,
+        epoch=_parse_worker_state['epoch'],
+        date_formats=_parse_worker_state['date_formats'],
+        timedelta_formats=_parse_worker_state['timedelta_formats'],
+    )
+    parser.row_counter = first_row - 1
+
+    rows = []
+    row_indexes = []
+    for row_index, cells in parser.parse():
+        if row_index < min_row:
+            continue
+        row = [None] * 4
+        for cell in cells:
+            if cell['column'] <= 4:
+                row[cell['column'] - 1] = cell['value']
+        if all(value is None for value in row):
+            continue
+        rows.append(row)
+        row_indexes.append(row_index)
+
+    error_log = []
+    valid_rows = ProductData.validate_rows(rows, row_indexes, error_log)
+    columns = tuple(
+        [getattr(product_data, attribute) for product_data in valid_rows]
+        for attribute in ('product_name', 'category_name', 'price', 'quantity', 'row_index')
+    )
+    return columns, error_log, len(rows)
+
+
+class ImportStatistics:
+    """Collects timers, row counts and SQL query counts of the import phases."""
+
+    def __init__(self, env):
+        self.env = env
+        self.started = time.perf_counter()
+        self.phases = {}  # Phase name to its accumulated seconds, queries and rows
+        self.rows_read = 0
+        self.rows_valid = 0
+        self.chunk_count = 0
+        self.chunk_size = None  # Chunk size in use, the one settled on when it is adapted during the import
+        self.duplicate_count = 0  # Rows collapsed into another row with the same key
+        self.duplicate_rows = []  # Sample of the collapsed row numbers
+
+    @contextmanager
+    def measure(self, phase, rows=0, flush=False):
+        """
+        Accumulate the time and SQL queries spent in a block under the given phase.
+        :param flush: Flush pending ORM writes before leaving the block, so their queries count for this phase
+        """
+        queries = self.env.cr.sql_log_count
+        start = time.perf_counter()
+        try:
+            yield
+            if flush:
+                self.env.flush_all()
+        finally:
+            stats = self._phase(phase)
+            stats['seconds'] += time.perf_counter() - start
+            stats['queries'] += self.env.cr.sql_log_count - queries
+            stats['rows'] += rows
+
+    def add_rows(self, phase, rows):
+        """Count rows handled by a phase outside of a measured block."""
+        self._phase(phase)['rows'] += rows
+
+    def _phase(self, phase):
+        return self.phases.setdefault(phase, {'seconds': 0.0, 'queries': 0, 'rows': 0})
+
+    @property
+    def duration(self):
+        return time.perf_counter() - self.started
+
+
+class ChunkSizer:
+    """
+    Chooses the size of the next chunk. A fixed size is kept as is. An adaptive size starts small and, after
+    every chunk, moves towards the size that would have taken the target duration, so per-chunk round trips
+    are amortised while a chunk (and a failed chunk) stays bounded in time and memory.
+    """
+
+    INITIAL_SIZE = 50
+    MIN_SIZE = 10
+    MAX_SIZE = 10000
+    # The size changes by at most this factor per chunk, so a single noisy chunk cannot swing it too far
+    MAX_STEP = 2.0
+    # Growth of the process peak memory (in kilobytes) above which a chunk is considered too large
+    MEMORY_BUDGET = 256 * 1024
+
+    def __init__(self, env, chunk_size, adaptive=False, target_duration=1.0, statistics=None):
+        self.env = env
+        self.statistics = statistics or ImportStatistics(env)
+        self.adaptive = adaptive
+        self.target_duration = target_duration if target_duration > 0 else 1.0
+        self.size = self.INITIAL_SIZE if adaptive else max(chunk_size, 1)
+        self.seconds_per_row = None
+        self.statistics.chunk_size = self.size
+
+    @contextmanager
+    def measure(self, rows):
+        """Measure the processing of a chunk of the given number of rows and adapt the size of the next one."""
+        queries = self.env.cr.sql_log_count
+        memory = self._peak_memory()
+        start = time.perf_counter()
+        yield
+        self.observe(rows, time.perf_counter() - start, self.env.cr.sql_log_count - queries,
+                     self._peak_memory() - memory)
+
+    def observe(self, rows, seconds, queries, memory):
+        """
+        Adapt the chunk size to the measurements of a processed chunk.
+        :param memory: Growth of the process peak memory during the chunk, in kilobytes
+        """
+        self.statistics.chunk_count += 1
+        if not self.adaptive or not rows:
+            return
+
+        # Average the cost per row with the previous chunks, one chunk may hit a cold cache or a slow query
+        seconds_per_row = seconds / rows
+        if self.seconds_per_row is not None:
+            seconds_per_row = (self.seconds_per_row + seconds_per_row) / 2
+        self.seconds_per_row = seconds_per_row
+
+        size = self.target_duration / max(seconds_per_row, 1e-6)
+        size = min(max(size, self.size / self.MAX_STEP), self.size * self.MAX_STEP)
+        if memory > self.MEMORY_BUDGET:
+            size = min(size, self.size / 2)
+        if rows < self.size:
+            # A short (last) chunk tells nothing about larger ones
+            size = min(size, self.size)
+        self.size = int(min(max(size, self.MIN_SIZE), self.MAX_SIZE))
+        self.statistics.chunk_size = self.size
+        _logger.debug("Chunk of %d rows took %.3fs, %d queries, %d KB peak memory growth, next chunk size %d",
+                      rows, seconds, queries, memory, self.size)
+
+    @staticmethod
+    def _peak_memory():
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+
+class RowDeduplicator:
+    """
+    Collapses valid rows repeating a (product name, category) key before any database work:
+    - last: the last occurrence of a key is imported
+    - first: the first occurrence of a key is imported
+    - sum: the last occurrence of a key is imported with the quantities of all occurrences summed
+    First wins needs a single pass. The other policies must see the whole file before emitting a row, so rows
+    are spooled to a temporary file while the key index is built and read back afterwards. Keys are indexed
+    as 8 byte digests, memory grows with the number of distinct products only.
+    A resumed import passes the rows already committed too: they are indexed so that the remaining rows
+    collapse against the whole file, but never emitted again.
+    """
+
+    # Number of rows indexed and spooled at once
+    BLOCK_SIZE = 1000
+    # Number of collapsed row numbers kept for the report
+    SAMPLE_ROWS = 20
+
+    def __init__(self, policy, statistics):
+        self.policy = policy
+        self.statistics = statistics
+
+    def deduplicate(self, rows, min_row=2):
+        """
+        :param rows: Iterable of valid ProductData instances in sheet order
+        :param min_row: First sheet row to import, earlier rows were committed by a previous run
+        :return: Iterable of the rows to import, in sheet order
+        """
+        if self.policy == 'first':
+            return self._first_wins(rows, min_row)
+        if self.policy in ('last', 'sum'):
+            return self._last_wins(rows, min_row)
+        return (product_data for product_data in rows if product_data.row_index >= min_row)
+
+    def _first_wins(self, rows, min_row):
+        seen = set()
+        for block in self._iter_blocks(rows):
+            kept = []
+            with self.statistics.measure('deduplication', rows=len(block)):
+                for product_data in block:
+                    key = self._key(product_data)
+                    if key not in seen:
+                        seen.add(key)
+                        if product_data.row_index >= min_row:
+                            kept.append(product_data)
+                    elif product_data.row_index >= min_row:
+                        self._skip(product_data)
+            yield from kept
+
+    def _last_wins(self, rows, min_row):
+        winners = {}  # Key digest to the row number of its winning occurrence
+        quantities = {}  # Key digest to the summed quantity, only used by the sum policy
+        with tempfile.TemporaryFile() as spool:
+            for block in self._iter_blocks(rows):
+                with self.statistics.measure('deduplication', rows=len(block)):
+                    for product_data in block:
+                        key = self._key(product_data)
+                        winners[key] = product_data.row_index
+                        if self.policy == 'sum':
+                            quantities[key] = quantities.get(key, 0) + product_data.quantity
+                    pickle.dump([(product_data.product_name, product_data.category_name, product_data.price,
+                                  product_data.quantity, product_data.row_index) for product_data in block],
+                                spool, protocol=pickle.HIGHEST_PROTOCOL)
+
+            spool.seek(0)
+            while True:
+                kept = []
+                with self.statistics.measure('deduplication'):
+                    try:
+                        block = pickle.load(spool)
+                    except EOFError:
+                        return
+                    for row in block:
+                        product_data = ProductData(*row)
+                        if product_data.row_index < min_row:
+                            continue
+                        key = self._key(product_data)
+                        if winners[key] != product_data.row_index:
+                            self._skip(product_data)
+                            continue
+                        if self.policy == 'sum':
+                            product_data.quantity = quantities[key]
+                        kept.append(product_data)
+                yield from kept
+
+    def _iter_blocks(self, rows):
+        iterator = iter(rows)
+        while True:
+            block = list(islice(iterator, self.BLOCK_SIZE))
+            if not block:
+                return
+            yield block
+
+    @staticmethod
+    def _key(product_data):
+        key = repr((product_data.product_name, product_data.category_name))
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+
+    def _skip(self, product_data):
+        self.statistics.duplicate_count += 1
+        if len(self.statistics.duplicate_rows) < self.SAMPLE_ROWS:
+            self.statistics.duplicate_rows.append(product_data.row_index)
 
 
 class CategoryManager:
     """Manages retrieval and creation of categories with caching for performance."""
 
-    def __init__(self, env):
+    def __init__(self, env, statistics=None):
         self.env = env
+        self.statistics = statistics or ImportStatistics(env)
         self.category_cache = {}  # Cache for categories to minimize DB queries
+        self.descriptions = {}  # Known descriptions of the prefetched categories
 
     def get_or_create(self, category_name, category_description):
         """
@@ -56,8 +544,9 @@ class CategoryManager:
         if category_name in self.category_cache:
             category = self.category_cache[category_name]
             # Update description if needed for cached category
-            if category.description != category_description:
+            if self.descriptions.get(category_name, category.description) != category_description:
                 category.write({'description': category_description})
+                self.descriptions[category_name] = category_description
             return category
 
         # Search for an existing category by name
@@ -75,18 +564,137 @@ class CategoryManager:
 
         # Cache the result after any necessary updates
         self.category_cache[category_name] = category
+        self.descriptions[category_name] = category_description
         return category
 
+    def prefetch(self, category_descriptions):
+        """
+        Resolve many categories at once so that get_or_create is served from the cache.
+        Categories resolved by earlier imports of the worker come from the shared category cache, the other
+        existing ones are loaded with one search_read, missing ones are created with a single multi-record
+        create and description changes are applied with one write per distinct description.
+        :param category_descriptions: Dictionary mapping category names to their descriptions
+        """
+        with self.statistics.measure('categories', rows=len(category_descriptions), flush=True):
+            self._prefetch(category_descriptions)
+
+    def _prefetch(self, category_descriptions):
+        Category = self.env['product.category']
+        to_load = [name for name in category_descriptions if name not in self.category_cache]
+
+        if to_load:
+            for name, (category_id, description) in shared_category_cache.get_many(self.env, to_load).items():
+                self.category_cache[name] = Category.browse(category_id)
+                self.descriptions[name] = description
+            to_load = [name for name in to_load if name not in self.category_cache]
+
+        if to_load:
+            loaded = {}
+            for record in Category.search_read([('name', 'in', to_load)], ['name', 'description'], order='id'):
+                # Keep the first match per name, like search(..., limit=1) in get_or_create
+                if record['name'] not in self.category_cache:
+                    self.category_cache[record['name']] = Category.browse(record['id'])
+                    self.descriptions[record['name']] = record['description']
+                    loaded[record['name']] = (record['id'], record['description'])
+            shared_category_cache.add_many(self.env, loaded)
+
+            missing = [name for name in to_load if name not in self.category_cache]
+            if missing:
+                created = Category.create([
+                    {'name': name, 'description': category_descriptions[name]} for name in missing
+                ])
+                self.category_cache.update(zip(missing, created))
+                self.descriptions.update((name, category_descriptions[name]) for name in missing)
+
+        # Group description changes so that each distinct description costs a single write
+        ids_by_description = defaultdict(list)
+        for name, description in category_descriptions.items():
+            if self.descriptions.get(name, self.category_cache[name].description) != description:
+                ids_by_description[description].append(self.category_cache[name].id)
+                self.descriptions[name] = description
+        for description, category_ids in ids_by_description.items():
+            Category.browse(category_ids).write({'description': description})
+
 
 class ProductManager:
     """Manages retrieval and creation of products."""
 
-    def __init__(self, env):
+    # Lookup key of a product, never changed by an update
+    KEY_FIELDS = ('name', 'categ_id')
+    # Plain stored fields which the fast path may update with a single SQL statement per chunk
+    FAST_UPDATE_FIELDS = ('price', 'quantity', 'import_hash')
+
+    def __init__(self, env, fast_update=False, skip_unchanged=False, statistics=None):
         self.env = env
+        self.statistics = statistics or ImportStatistics(env)
+        self.fast_update_dependents = {}  # Model name to the inherited fields invalidated after a fast update
+        self.fast_update = fast_update and self._fast_update_supported()
+        self.skip_unchanged = skip_unchanged
+        self.created_count = 0
+        self.updated_count = 0
+        self.unchanged_count = 0  # Rows dropped because the stored product already has the same content
+
+    def _fast_update_supported(self):
+        """
+        Check that the fast update fields are plain stored columns: bypassing the ORM is only safe if no
+        computed field, inverse or tracking depends on them. The only dependents allowed are the non-stored
+        fields variants inherit through _inherits, whose cache is invalidated after the update.
+        """
+        Product = self.env['product.template']
+        for field_name in self.FAST_UPDATE_FIELDS:
+            field = Product._fields[field_name]
+            if (not field.store or field.type not in ('integer', 'float', 'char') or field.compute or field.inverse
+                    or getattr(field, 'tracking', False)):
+                return False
+            for dependent in self._iter_triggered_fields(self.env.registry.field_triggers.get(field)):
+                if dependent.store or not dependent.inherited:
+                    return False
+                self.fast_update_dependents.setdefault(dependent.model_name, set()).add(dependent.name)
+        return True
+
+    @classmethod
+    def _iter_triggered_fields(cls, tree):
+        """Fields of a registry trigger tree, i.e. all the fields recomputed or invalidated when its field changes."""
+        if tree is not None:
+            yield from tree.root
+            for subtree in tree.values():
+                yield from cls._iter_triggered_fields(subtree)
+
+    def fetch_existing_products(self, keys, hash_index=None):
+        """
+        Resolve existing products for a set of (name, categ_id) keys with a single query.
+        :param keys: Iterable of (product name, category id) tuples
+        :param hash_index: Optional dictionary filled with the import hash of every found product id
+        :return: Dictionary mapping (name, categ_id) to the product.template id
+        """
+        keys = set(keys)
+        if not keys:
+            return {}
+
+        names = {name for name, _categ_id in keys}
+        categ_ids = {categ_id for _name, categ_id in keys}
+        # Names are matched in en_US, which is the expression of the (name, categ_id) index
+        records = self.env['product.template'].with_context(lang='en_US').search_read(
+            [('name', 'in', list(names)), ('categ_id', 'in', list(categ_ids))],
+            ['name', 'categ_id', 'import_hash'],
+            order='id',
+        )
+
+        # The search above matches the cross product of names and categories, so keep only requested keys.
+        # The lowest id wins, matching the previous search(..., limit=1) behaviour.
+        product_index = {}
+        for record in records:
+            key = (record['name'], record['categ_id'][0])
+            if key in keys and key not in product_index:
+                product_index[key] = record['id']
+                if hash_index is not None:
+                    hash_index[record['id']] = record['import_hash']
+        return product_index
 
     def batch_update_or_create(self, products_data, category_manager, error_log, chunk_size=100):
         """
         Batch process products to either create or update them in bulk, reducing database writes.
+        Existing products of every chunk are resolved with one query instead of one search per row.
         :param products_data: List of ProductData instances
         :param category_manager: Instance of CategoryManager for category handling
         :param chunk_size: Number of records to process in each batch
@@ -94,88 +702,612 @@ class ProductManager:
         for i in range(0, len(products_data), chunk_size):
             batch = products_data[i:i + chunk_size]
 
-            # Separate data into "to_update" and "to_create" based on existing records
-            to_update = []
-            to_create = []
+            # Resolve all categories of the chunk up front (served from the cache after the first chunk)
+            category_manager.prefetch({data.category_name: data.category_name for data in batch})
 
+            # Prepare data for bulk operation
+            rows = []
             for product_data in batch:
                 # Get or create the category with name and description (they are the same because of the example excel file)
                 category = category_manager.get_or_create(product_data.category_name, product_data.category_name)
-
-                # Check if the product already exists
-                product = self.env['product.template'].search([
-                    ('name', '=', product_data.product_name),
-                    ('categ_id', '=', category.id)
-                ], limit=1)
-
-                # Prepare data for bulk operation
-                product_data_dict = {
+                rows.append((product_data, {
                     'name': product_data.product_name,
                     'categ_id': category.id,
                     'price': product_data.price,
-                    'quantity': product_data.quantity
-                }
+                    'quantity': product_data.quantity,
+                    'import_hash': product_data.content_hash(),
+                }))
+
+            # Look up every product of the chunk at once
+            hash_index = {}
+            with self.statistics.measure('lookup', rows=len(rows)):
+                product_index = self.fetch_existing_products(
+                    ((values['name'], values['categ_id']) for _product_data, values in rows), hash_index
+                )
 
-                if product:
-                    # Prepare for bulk update
-                    to_update.append((product.id, product_data_dict))
+            # Separate data into "to_update" and "to_create" based on existing records
+            to_update = []
+            to_create = []
+            for product_data, values in rows:
+                product_id = product_index.get((values['name'], values['categ_id']))
+                if product_id and self.skip_unchanged and hash_index[product_id] == values['import_hash']:
+                    # Drop rows whose content is already stored before any write
+                    self.unchanged_count += 1
+                elif product_id:
+                    to_update.append((product_id, product_data, values))
                 else:
-                    # Prepare for bulk create
-                    to_create.append(product_data_dict)
+                    to_create.append((product_data, values))
 
-            # Perform bulk updates with error handling
-            if to_update:
-                for product_id, update_data in to_update:
-                    try:
-                        self.env['product.template'].browse(product_id).write(update_data)
-                    except Exception as e:
-                        # Log update error, but continue with the rest of the batch
-                        error_log.append(_("Failed to update product '%s' in row %d: %s") % (
-                            update_data['name'], product_data.row_index, str(e)
-                        ))
-
-            # Perform bulk creates with error handling
-            if to_create:
-                try:
-                    self.env['product.template'].create(to_create)
-                except Exception as e:
-                    # Log creation error, and specify that these rows failed in bulk creation
-                    error_log.append(_("Failed to create products in rows [%s]: %s") % (
-                        ", ".join(str(data.row_index) for data in batch), str(e)
-                    ))
+            with self.statistics.measure('writes', rows=len(to_update) + len(to_create), flush=True):
+                self._write_chunk(to_update, to_create, error_log)
+
+    def _write_chunk(self, to_update, to_create, error_log):
+        """
+        Write the updates and creates of a chunk. Both run inside savepoints, a failing row only rejects itself.
+        :param to_update: List of (product id, ProductData, values) tuples
+        :param to_create: List of (ProductData, values) tuples of the products to create
+        """
+        # Apply plain price/quantity updates with one statement, everything else goes through the ORM
+        if self.fast_update:
+            fast_updates = [
+                update for update in to_update
+                if set(update[2]) <= set(self.KEY_FIELDS + self.FAST_UPDATE_FIELDS)
+            ]
+            if fast_updates and self._write_fast(fast_updates):
+                fast_ids = {product_id for product_id, _product_data, _values in fast_updates}
+                to_update = [update for update in to_update if update[0] not in fast_ids]
+                self.updated_count += len(fast_updates)
+
+        Product = self.env['product.template']
+
+        def write_updates(updates):
+            for product_id, _product_data, update_data in updates:
+                # The key fields matched the product: the name was matched in en_US, writing it back would
+                # replace its translation in the user's language
+                Product.browse(product_id).write({
+                    field_name: value for field_name, value in update_data.items()
+                    if field_name not in self.KEY_FIELDS
+                })
+
+        def create_products(creates):
+            Product.create([values for _product_data, values in creates])
+
+        # Perform bulk updates with error handling
+        if to_update:
+            self.updated_count += self._write_isolated(
+                to_update, write_updates,
+                lambda update, e: ErrorMessage(_("Failed to update product '%s' in row %d: %s") % (
+                    update[1].product_name, update[1].row_index, str(e)
+                ), 'update_failed', update[1].row_index),
+                error_log,
+            )
+
+        # Perform bulk creates with error handling
+        if to_create:
+            self.created_count += self._write_isolated(
+                to_create, create_products,
+                lambda create, e: ErrorMessage(_("Failed to create product '%s' in row %d: %s") % (
+                    create[1]['name'], create[0].row_index, str(e)
+                ), 'create_failed', create[0].row_index),
+                error_log,
+            )
+
+    def _write_isolated(self, rows, write, describe_error, error_log):
+        """
+        Write rows inside a savepoint, flushed before it is released so that database errors surface here.
+        When the write fails, the rows are bisected recursively until only the failing rows are rejected:
+        a single bad row costs about 2 * log2(len(rows)) extra savepoints, a clean chunk costs one.
+        :param rows: List of rows to write, in sheet order
+        :param write: Function writing a list of rows
+        :param describe_error: Function returning the error log line of a rejected row and its exception
+        :return: Number of written rows
+        """
+        try:
+            with self.env.cr.savepoint():
+                write(rows)
+            return len(rows)
+        except Exception as e:
+            if len(rows) == 1:
+                error_log.append(describe_error(rows[0], e))
+                return 0
+            middle = len(rows) // 2
+            return (self._write_isolated(rows[:middle], write, describe_error, error_log)
+                    + self._write_isolated(rows[middle:], write, describe_error, error_log))
+
+    def _write_fast(self, updates):
+        """
+        Update the fast update fields of many products with a single UPDATE ... FROM (VALUES ...) statement
+        and invalidate the ORM cache of the touched records.
+        :param updates: List of (product id, ProductData, values) tuples
+        :return: True on success, False if the user may not write every product or the statement failed, the
+            ORM path should be used instead
+        """
+        Product = self.env['product.template']
+        columns = [Product._fields[field_name] for field_name in self.FAST_UPDATE_FIELDS]
+
+        # Pending ORM writes on these columns must reach the database before they are overwritten
+        Product.flush_model(self.FAST_UPDATE_FIELDS)
+
+        # A product may appear several times in a chunk, the last occurrence wins like with sequential writes
+        values_by_id = {product_id: values for product_id, _product_data, values in updates}
+
+        # The statement bypasses write(), enforce the access rights and record rules it would check. Products
+        # the user may not write are left to the ORM path, which rejects them row by row.
+        try:
+            Product.browse(list(values_by_id)).check_access('write')
+        except AccessError:
+            return False
+        rows = SQL(", ").join(
+            SQL("(%s, %s)", product_id, SQL(", ").join(
+                SQL(f"%s::{field.column_type[1]}", field.convert_to_cache(values[field.name], Product))
+                for field in columns
+            ))
+            for product_id, values in values_by_id.items()
+        )
+        query = SQL(
+            "UPDATE product_template AS product SET %s, write_uid = %s, write_date = %s "
+            "FROM (VALUES %s) AS data(id, %s) WHERE product.id = data.id",
+            SQL(", ").join(SQL("%s = data.%s", SQL.identifier(field.name), SQL.identifier(field.name))
+                           for field in columns),
+            self.env.uid, fields.Datetime.now(), rows,
+            SQL(", ").join(SQL.identifier(field.name) for field in columns),
+        )
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute(query)
+        except Exception:
+            return False
+
+        Product.browse(list(values_by_id)).invalidate_recordset(
+            list(self.FAST_UPDATE_FIELDS) + ['write_uid', 'write_date']
+        )
+        for model_name, field_names in self.fast_update_dependents.items():
+            self.env[model_name].invalidate_model(list(field_names))
+        return True
+
+
+class ImportPreview:
+    """
+    Dry run of an import. Rows are resolved against in-memory indexes of all categories and products, each
+    prefetched with a single query, and nothing is written to the database.
+    """
+
+    # Number of new category names listed in the preview
+    NEW_CATEGORY_SAMPLE = 100
+
+    def __init__(self, env, statistics=None, skip_unchanged=False):
+        self.env = env
+        self.statistics = statistics or ImportStatistics(env)
+        self.skip_unchanged = skip_unchanged
+        self.category_index = {}  # Category name to its id, or to its name for categories the import would create
+        self.product_index = {}  # (name, category key) to the import hash the product would have
+        self.new_categories = {}  # Names of the categories the import would create, in sheet order
+        self.created_count = 0
+        self.updated_count = 0
+        self.unchanged_count = 0
+
+    def prefetch(self):
+        """Load the category and product indexes, the lowest id wins like in the import."""
+        with self.statistics.measure('categories'):
+            for record in self.env['product.category'].search_read([], ['name'], order='id'):
+                self.category_index.setdefault(record['name'], record['id'])
+        with self.statistics.measure('lookup'):
+            for record in self.env['product.template'].with_context(lang='en_US').search_read(
+                    [], ['name', 'categ_id', 'import_hash'], order='id'):
+                self.product_index.setdefault((record['name'], record['categ_id'][0]), record['import_hash'])
+
+    def add_rows(self, rows):
+        """
+        Classify valid rows as creates, updates or unchanged rows. Rows are applied to the indexes as the
+        import would write them, so a product repeated in the file is created once and then updated.
+        Like in the import, a row is only unchanged when unchanged rows are skipped and the product's import
+        hash matches: products created or edited outside the importer are always updated.
+        :param rows: Iterable of valid ProductData instances
+        """
+        for product_data in rows:
+            category_key = self.category_index.get(product_data.category_name)
+            if category_key is None:
+                category_key = self.category_index[product_data.category_name] = product_data.category_name
+                self.new_categories[product_data.category_name] = True
+
+            key = (product_data.product_name, category_key)
+            content_hash = product_data.content_hash()
+            if key not in self.product_index:
+                self.created_count += 1
+            elif self.skip_unchanged and self.product_index[key] == content_hash:
+                self.unchanged_count += 1
+            else:
+                self.updated_count += 1
+            self.product_index[key] = content_hash
+
+
+class ExcelImportMixin(models.AbstractModel):
+    """Shared file handling, streaming and error log logic for the Excel import wizard and import jobs."""
+
+    _name = 'tech.gear.excel.import.mixin'
+    _description = 'Excel Import Mixin for Tech Gear Inventory'
+
+    file = fields.Binary("File", required=True, attachment=True)
+    error_log_file = fields.Binary("Error Log File", readonly=True, attachment=True)
+    error_log_filename = fields.Char("Error Log Filename", readonly=True, default="error_log.txt.gz")
+    error_summary = fields.Text("Error Summary", readonly=True)
+    duplicate_policy = fields.Selection([
+        ('none', 'Import Every Row'),
+        ('last', 'Last Row Wins'),
+        ('first', 'First Row Wins'),
+        ('sum', 'Sum Quantities'),
+    ], string="Duplicate Rows", default='last', required=True,
+        help="How rows repeating the product name and category of another row of the file are collapsed "
+             "before importing. Sum Quantities keeps the last row with the quantities of all rows summed")
+    max_errors = fields.Integer("Maximum Errors", default=0,
+                                help="Stop reading the file once this many errors were found, so a broken file "
+                                     "fails fast. 0 never stops")
+    chunk_size = fields.Integer("Chunk Size", default=100, help="Number of records to process in each batch")
+    chunk_size_mode = fields.Selection([
+        ('fixed', 'Fixed'),
+        ('auto', 'Auto'),
+    ], string="Chunk Sizing", default='fixed', required=True,
+        help="Auto starts with small batches and grows or shrinks them during the import to reach the target "
+             "batch duration")
+    chunk_target_duration = fields.Float("Target Chunk Duration (s)", default=1.0,
+                                         help="Processing time aimed at for each batch in auto chunk sizing")
+    fast_update = fields.Boolean("Fast Price/Quantity Updates",
+                                 help="Update price and quantity of existing products with one SQL statement per "
+                                      "batch instead of one ORM write per product")
+    parse_workers = fields.Integer("Parsing Processes", default=0,
+                                   help="Number of processes parsing and validating the sheet in parallel, "
+                                        "0 or 1 parses in the importing process. Each process is a fork of "
+                                        "the server, their number is capped by the administrator")
+    skip_unchanged = fields.Boolean("Skip Unchanged Data", default=True,
+                                    help="Skip a file identical to the last import and drop rows whose product "
+                                         "already has the same content before writing")
+
+    @api.constrains('parse_workers')
+    def _check_parse_workers(self):
+        max_workers = self._get_max_parse_workers()
+        for record in self:
+            if not 0 <= record.parse_workers <= max_workers:
+                raise ValidationError(_("The number of parsing processes must be between 0 and %d.", max_workers))
+
+    def _get_max_parse_workers(self):
+        """Maximum number of parsing processes, set by a system parameter and defaulting to the CPU count."""
+        max_workers = self.env['ir.config_parameter'].sudo().get_param(MAX_PARSE_WORKERS_PARAM)
+        return int(max_workers) if max_workers else os.cpu_count() or 1
+
+    def download_error_log(self):
+        """
+        Allows users to download the error log file after the import process if errors are present.
+        """
+        if self.error_log_file:
+            return {
+                'type': 'ir.actions.act_url',
+                'url': f'/web/content/{self._name}/{self.id}/error_log_file/{self.error_log_filename}',
+                'target': 'self',
+            }
+        else:
+            raise ValidationError(_("No error log file available for download."))
+
+    def _get_import_fingerprint(self):
+        """
+        Fingerprint of the uploaded file combined with the state of the catalog and the duplicate policy. A file
+        is only considered already imported while no product or category changed since, so manual edits are
+        never masked, and with the same policy, since another policy merges duplicate rows differently.
+        """
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            "SELECT (SELECT count(*) FROM product_template), (SELECT max(write_date) FROM product_template), "
+            "(SELECT max(write_date) FROM product_category)"
+        ))
+        catalog_state = self.env.cr.fetchone()
+        # The checksum of the stored file avoids loading it, the base64 value is only hashed before it is stored
+        attachment = self._get_file_attachment()
+        file_hash = attachment.checksum if attachment else hashlib.sha256(self.file or b'').hexdigest()
+        return "%s:%s:%s" % (file_hash, self.duplicate_policy, ":".join(str(value) for value in catalog_state))
+
+    def _is_already_imported(self):
+        """Check whether this exact file was the last successful import and nothing changed since."""
+        last_fingerprint = self.env['ir.config_parameter'].sudo().get_param(IMPORT_FINGERPRINT_PARAM)
+        return last_fingerprint == self._get_import_fingerprint()
+
+    def _remember_import(self):
+        """Store the fingerprint of a successful import for the next upload to compare against."""
+        self.env['ir.config_parameter'].sudo().set_param(IMPORT_FINGERPRINT_PARAM, self._get_import_fingerprint())
+
+    def _create_import_log(self, statistics, product_manager, error_count, **values):
+        """Persist the statistics of an import run on a tech.gear.import.log record."""
+        return self.env['tech.gear.import.log'].create(dict(
+            values,
+            chunk_size_mode=self.chunk_size_mode,
+            chunk_size=statistics.chunk_size or self.chunk_size,
+            chunk_count=statistics.chunk_count,
+            rows_read=statistics.rows_read,
+            rows_valid=statistics.rows_valid,
+            duplicate_policy=self.duplicate_policy,
+            duplicate_count=statistics.duplicate_count,
+            duplicate_rows=", ".join(str(row_index) for row_index in statistics.duplicate_rows),
+            created_count=product_manager.created_count,
+            updated_count=product_manager.updated_count,
+            unchanged_count=product_manager.unchanged_count,
+            error_count=error_count,
+            duration=statistics.duration,
+            query_count=sum(stats['queries'] for stats in statistics.phases.values()),
+            phase_ids=[
+                Command.create({'phase': phase, **stats}) for phase, stats in statistics.phases.items()
+            ],
+        ))
+
+    def _generate_error_log_file(self, error_log, append=False):
+        """
+        Store the compressed error lines as downloadable file, along with the aggregated error summary.
+        :param error_log: ErrorLog, or any iterable of error lines
+        :param append: Append to the existing file, gzip streams concatenate into a single file
+        """
+        if not isinstance(error_log, ErrorLog):
+            lines, error_log = error_log, ErrorLog()
+            error_log.extend(lines)
+        data = error_log.compressed()
+        if append and self.error_log_file:
+            data = base64.b64decode(self.error_log_file) + data
+        self.write({
+            'error_log_file': base64.b64encode(data),
+            'error_summary': error_log.summary(),
+        })
+
+    def _iter_valid_rows(self, sheet, error_log, min_row=2, statistics=None):
+        """
+        Lazily turn sheet rows into validated ProductData instances.
+        Invalid rows are reported in the error log and skipped, blank rows are ignored.
+        :param min_row: First sheet row to read, used to resume an interrupted import
+        :param statistics: ImportStatistics collecting the parse and validation phases
+        """
+        statistics = statistics or ImportStatistics(self.env)
+        # The cap may have been lowered since the import was set up
+        workers = min(self.parse_workers, self._get_max_parse_workers())
+        if workers > 1:
+            return self._iter_valid_rows_parallel(sheet, error_log, min_row, statistics, workers)
+        return self._iter_valid_rows_sequential(sheet, error_log, min_row, statistics)
+
+    def _iter_valid_rows_sequential(self, sheet, error_log, min_row, statistics):
+        rows = sheet.iter_rows(min_row=min_row, max_col=4, values_only=True)
+        row_index = min_row
+        while True:
+            # Rows are read and validated in blocks, so validation runs over whole columns
+            with statistics.measure('parse'):
+                block = list(islice(rows, VALIDATION_BLOCK_SIZE))
+            if not block:
+                return
+            row_indexes = [index for index, row in enumerate(block, start=row_index)
+                           if not all(value is None for value in row)]
+            block = [block[index - row_index] for index in row_indexes]
+            row_index += VALIDATION_BLOCK_SIZE
+            statistics.rows_read += len(block)
+            statistics.add_rows('parse', len(block))
+
+            with statistics.measure('validation', rows=len(block)):
+                valid_rows = ProductData.validate_rows(block, row_indexes, error_log)
+            statistics.rows_valid += len(valid_rows)
+            yield from valid_rows
+
+    def _iter_valid_rows_parallel(self, sheet, error_log, min_row, statistics, workers):
+        """
+        Parse and validate the sheet in a pool of processes. The worksheet XML is split into row-aligned
+        segments (openpyxl cannot seek to a row, so row ranges would each re-parse the sheet from the top),
+        and the compact validated rows are handed back in sheet order to the single DB-writing stage.
+        At most two segments per process are in flight, which keeps memory bounded.
+        Validation runs in the workers, so its time is part of the parse phase, which measures the wait
+        for parsed segments.
+        :param workers: Number of parsing processes
+        """
+        workbook = sheet.parent
+        with workbook._archive.open(sheet._worksheet_path) as source:
+            segments = iter_sheet_segments(source)
+            try:
+                worksheet_tag = next(segments)
+            except (StopIteration, ValueError):
+                yield from self._iter_valid_rows_sequential(sheet, error_log, min_row, statistics)
+                return
+
+            # Forked processes inherit the loaded registry, spawned ones could not import the addon
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'),
+                                     initializer=_init_parse_worker,
+                                     initargs=(sheet._shared_strings, workbook.epoch, workbook._date_formats,
+                                               workbook._timedelta_formats)) as executor:
+                pending = deque()
+                first_row = 1
+                for segment in segments:
+                    pending.append(executor.submit(_parse_sheet_segment, worksheet_tag, segment, first_row, min_row))
+                    first_row += len(ROW_START_PATTERN.findall(segment))
+                    if len(pending) >= 2 * workers:
+                        yield from self._collect_parsed_segment(pending.popleft(), error_log, statistics)
+                while pending:
+                    yield from self._collect_parsed_segment(pending.popleft(), error_log, statistics)
+
+    @staticmethod
+    def _collect_parsed_segment(future, error_log, statistics):
+        with statistics.measure('parse'):
+            valid_columns, segment_errors, rows_read = future.result()
+        statistics.rows_read += rows_read
+        statistics.rows_valid += len(valid_columns[0])
+        statistics.add_rows('parse', rows_read)
+        error_log.extend(segment_errors)
+        yield from map(ProductData, *valid_columns)
+
+    def _deduplicate_rows(self, rows, statistics, min_row=2):
+        """
+        Collapse rows repeating a product key according to the duplicate policy.
+        :param min_row: First sheet row to import, rows before it must be included when resuming an import
+        """
+        return RowDeduplicator(self.duplicate_policy, statistics).deduplicate(rows, min_row=min_row)
+
+    def _get_chunk_sizer(self, statistics):
+        """Chunk sizer of an import run, fixed or adaptive depending on the chunk sizing mode."""
+        return ChunkSizer(self.env, self.chunk_size, adaptive=self.chunk_size_mode == 'auto',
+                          target_duration=self.chunk_target_duration, statistics=statistics)
+
+    @staticmethod
+    def _iter_chunks(iterable, chunk_size):
+        """
+        Group any iterable into lists of at most chunk_size items without materialising it.
+        :param chunk_size: Size of the chunks, or a callable returning the size of the next chunk
+        """
+        iterator = iter(iterable)
+        while True:
+            chunk = list(islice(iterator, chunk_size() if callable(chunk_size) else chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _get_file_attachment(self):
+        """Attachment storing the uploaded file, empty if the record is not saved yet."""
+        if not self.id:
+            return self.env['ir.attachment']
+        return self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name), ('res_field', '=', 'file'), ('res_id', '=', self.id),
+        ], limit=1)
+
+    @contextmanager
+    def _open_excel_sheet(self, statistics=None):
+        """
+        Spool the uploaded file to a temporary file and open its active sheet in read-only mode.
+        The file is copied block by block from its attachment in the filestore and the sheet is read lazily,
+        so neither the file nor the whole workbook is ever held in memory. Attachments stored in the database
+        are loaded raw, the base64 value is only decoded (block by block) for a file not stored yet.
+        :param statistics: ImportStatistics collecting the decode phase
+        """
+        statistics = statistics or ImportStatistics(self.env)
+        with tempfile.TemporaryFile(suffix='.xlsx') as spool:
+            try:
+                with statistics.measure('decode'):
+                    attachment = self._get_file_attachment()
+                    if attachment.store_fname:
+                        with open(attachment._full_path(attachment.store_fname), 'rb') as source:
+                            shutil.copyfileobj(source, spool, DECODE_BLOCK_SIZE)
+                    elif attachment:
+                        spool.write(attachment.raw)
+                    else:
+                        data = self.file or b''
+                        for start in range(0, len(data), DECODE_BLOCK_SIZE):
+                            spool.write(base64.b64decode(data[start:start + DECODE_BLOCK_SIZE]))
+                    spool.seek(0)
+                    workbook = openpyxl.load_workbook(filename=spool, read_only=True, data_only=True)
+            except Exception as e:
+                raise ValidationError(_("Unable to load the Excel file. Ensure it's a valid file. Error: %s") % str(e))
+
+            try:
+                yield workbook.active
+            finally:
+                workbook.close()
 
 
 class ExcelImportWizard(models.TransientModel):
     _name = 'tech.gear.excel.import.wizard'
+    _inherit = 'tech.gear.excel.import.mixin'
     _description = 'Excel Import Wizard for Tech Gear Inventory'
 
-    file = fields.Binary("File", required=True)
-    error_log_file = fields.Binary("Error Log File", readonly=True, attachment=True)
-    error_log_filename = fields.Char("Error Log Filename", readonly=True, default="error_log.txt")
-    chunk_size = fields.Integer("Chunk Size", default=100, help="Number of records to process in each batch")
+    import_log_id = fields.Many2one('tech.gear.import.log', string="Import Statistics", readonly=True)
+    import_summary = fields.Text(related='import_log_id.summary')
+    import_phase_ids = fields.One2many(related='import_log_id.phase_ids')
+    preview_done = fields.Boolean("Previewed", readonly=True)
+    preview_create_count = fields.Integer("Products to Create", readonly=True)
+    preview_update_count = fields.Integer("Products to Update", readonly=True)
+    preview_unchanged_count = fields.Integer("Unchanged Products", readonly=True)
+    preview_error_count = fields.Integer("Errors", readonly=True)
+    preview_duplicate_count = fields.Integer("Collapsed Duplicate Rows", readonly=True)
+    preview_new_category_count = fields.Integer("New Categories", readonly=True)
+    preview_new_categories = fields.Text("New Category Names", readonly=True)
+    preview_duration = fields.Float("Preview Duration (s)", readonly=True)
+
+    def action_preview(self):
+        """
+        Report how many products the import would create, update or leave unchanged and which categories
+        are new, without writing anything. The wizard is reopened with the results so it can be imported next.
+        """
+        statistics = ImportStatistics(self.env)
+        preview = ImportPreview(self.env, statistics, skip_unchanged=self.skip_unchanged)
+        error_log = ErrorLog(self.max_errors)
+
+        preview.prefetch()
+        try:
+            with self._open_excel_sheet(statistics) as sheet:
+                valid_rows = self._iter_valid_rows(sheet, error_log, statistics=statistics)
+                preview.add_rows(self._deduplicate_rows(valid_rows, statistics))
+        except ErrorLimitReached:
+            pass
+
+        new_categories = list(preview.new_categories)
+        sample = new_categories[:ImportPreview.NEW_CATEGORY_SAMPLE]
+        if len(new_categories) > len(sample):
+            sample.append(_("... and %d more", len(new_categories) - len(sample)))
+        if error_log:
+            self._generate_error_log_file(error_log)
+        self.write({
+            'preview_done': True,
+            'preview_create_count': preview.created_count,
+            'preview_update_count': preview.updated_count,
+            'preview_unchanged_count': preview.unchanged_count,
+            'preview_error_count': len(error_log),
+            'preview_duplicate_count': statistics.duplicate_count,
+            'preview_new_category_count': len(new_categories),
+            'preview_new_categories': "\n".join(sample),
+            'preview_duration': statistics.duration,
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'tech.gear.excel.import.wizard',
+            'view_mode': 'form',
+            'res_id': self.id,
+            'target': 'new',
+            'name': _("Import Preview"),
+        }
 
     def import_excel(self):
-        # Load the sheet and initialize components
-        sheet = self._load_excel_sheet()
-        category_manager = CategoryManager(self.env)
-        product_manager = ProductManager(self.env)
+        # Re-uploading the last imported file is a no-op as long as the catalog did not change
+        if self.skip_unchanged and self._is_already_imported():
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': _("Nothing to Import"),
+                    'message': _("This file is identical to the last import and the catalog has not changed."),
+                    'sticky': False,
+                }
+            }
 
-        # Initialize error log and valid row storage
-        error_log = []
-        valid_rows = []
+        # Initialize components, which all record their phases in the same statistics
+        statistics = ImportStatistics(self.env)
+        chunk_sizer = self._get_chunk_sizer(statistics)
+        category_manager = CategoryManager(self.env, statistics)
+        product_manager = ProductManager(self.env, fast_update=self.fast_update, skip_unchanged=self.skip_unchanged,
+                                         statistics=statistics)
 
-        # Collect valid rows
-        for row_index, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-            product_data = ProductData(*row, row_index=row_index)
-            if product_data.validate(error_log):
-                valid_rows.append(product_data)
+        # Initialize error log
+        error_log = ErrorLog(self.max_errors)
+
+        # Stream valid rows chunk by chunk from the spooled file so that memory is bounded by the chunk size.
+        # Categories of each chunk are resolved in bulk by batch_update_or_create before its products.
+        try:
+            with self._open_excel_sheet(statistics) as sheet:
+                valid_rows = self._iter_valid_rows(sheet, error_log, statistics=statistics)
+                valid_rows = self._deduplicate_rows(valid_rows, statistics)
+                for chunk in self._iter_chunks(valid_rows, lambda: chunk_sizer.size):
+                    with chunk_sizer.measure(len(chunk)):
+                        product_manager.batch_update_or_create(chunk, category_manager, error_log,
+                                                               chunk_size=len(chunk))
+        except ErrorLimitReached:
+            # The rest of the file is not read, chunks written so far are kept like with a background job
+            pass
 
-        # Process valid rows in batch and generate error log file if necessary
-        product_manager.batch_update_or_create(valid_rows, category_manager, error_log, chunk_size=self.chunk_size)
+        # Only clean imports are remembered, a file with errors is always processed again
+        if self.skip_unchanged and not error_log:
+            self._remember_import()
 
-        # If errors occurred, generate the error log file and open a dialog with a download button
         if error_log:
-            self._generate_error_log_file(error_log)
+            with statistics.measure('error_log', rows=len(error_log)):
+                self._generate_error_log_file(error_log)
+        self.import_log_id = self._create_import_log(statistics, product_manager, len(error_log), source='wizard')
+
+        # If errors occurred, open a dialog with a download button
+        if error_log:
             return {
                 'type': 'ir.actions.act_window',
                 'res_model': 'tech.gear.excel.import.wizard',
@@ -192,37 +1324,37 @@ class ExcelImportWizard(models.TransientModel):
                 'tag': 'display_notification',
                 'params': {
                     'title': _("Import Successful"),
-                    'message': _("The product data has been successfully imported."),
+                    'message': _("The product data has been successfully imported. %s", self.import_summary),
                     'sticky': False,
                 }
             }
 
-    def download_error_log(self):
+    def import_excel_background(self):
         """
-        Allows users to download the error log file after the import process if errors are present.
+        Queue the uploaded file as a background import job and open it so the progress can be followed.
         """
-        if self.error_log_file:
-            return {
-                'type': 'ir.actions.act_url',
-                'url': f'/web/content/{self._name}/{self.id}/error_log_file/{self.error_log_filename}',
-                'target': 'self',
-            }
+        job = self.env['tech.gear.import.job'].create({
+            'chunk_size': self.chunk_size,
+            'chunk_size_mode': self.chunk_size_mode,
+            'chunk_target_duration': self.chunk_target_duration,
+            'fast_update': self.fast_update,
+            'skip_unchanged': self.skip_unchanged,
+            'parse_workers': self.parse_workers,
+            'max_errors': self.max_errors,
+            'duplicate_policy': self.duplicate_policy,
+        })
+        # Copying the attachment shares the stored file, reading self.file would load its base64 value
+        attachment = self._get_file_attachment()
+        if attachment:
+            attachment.copy({'res_model': job._name, 'res_id': job.id})
         else:
-            raise ValidationError(_("No error log file available for download."))
-
-    def _generate_error_log_file(self, error_log):
-        log_content = "\n".join(error_log)
-        log_file = BytesIO()
-        log_file.write(log_content.encode('utf-8'))
-        log_file.seek(0)
-        self.error_log_file = base64.b64encode(log_file.read())
-        log_file.close()
-
-    def _load_excel_sheet(self):
-        try:
-            data = base64.b64decode(self.file)
-            workbook = openpyxl.load_workbook(filename=BytesIO(data), data_only=True)
-            return workbook.active
-        except Exception as e:
-            raise ValidationError(_("Unable to load the Excel file. Ensure it's a valid file. Error: %s") % str(e))
-
+            job.file = self.file
+        job._trigger_processing()
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'tech.gear.import.job',
+            'view_mode': 'form',
+            'res_id': job.id,
+            'target': 'current',
+            'name': _("Import Job"),
+        }
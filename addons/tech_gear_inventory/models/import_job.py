@@ -0,0 +1,168 @@
+import copy
+import logging
+import time
+from itertools import chain, takewhile
+from odoo import api, models, fields, _
+from .excel_import_wizard import CategoryManager, ErrorLimitReached, ErrorLog, ImportStatistics, ProductManager
+
+_logger = logging.getLogger(__name__)
+
+
+class ImportJob(models.Model):
+    # Persistent counterpart of the import wizard. Jobs are processed by a cron-driven worker which commits
+    # after every chunk, so large files neither hit HTTP worker timeouts nor hold row locks for minutes.
+    # The last committed row is stored on the job, which lets an interrupted job resume where it stopped.
+
+    _name = 'tech.gear.import.job'
+    _inherit = 'tech.gear.excel.import.mixin'
+    _description = 'Background Excel Import Job for Tech Gear Inventory'
+    _order = 'id desc'
+
+    name = fields.Char("Name", required=True, readonly=True,
+                       default=lambda self: _("Import %s") % fields.Datetime.now())
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string="Status", default='pending', required=True, readonly=True)
+    last_row_index = fields.Integer("Last Committed Row", default=1, readonly=True,
+                                    help="Last sheet row committed to the database, the header is row 1")
+    rows_total = fields.Integer("Total Rows", readonly=True)
+    rows_done = fields.Integer("Processed Rows", readonly=True)
+    progress = fields.Float("Progress", compute='_compute_progress')
+    error_count = fields.Integer("Errors", readonly=True)
+    error_groups = fields.Json("Error Groups", readonly=True,
+                               help="Aggregated errors of all runs, continued by a resumed run")
+    duration = fields.Float("Duration (s)", readonly=True, help="Processing time accumulated over all runs")
+    throughput = fields.Float("Throughput (rows/s)", compute='_compute_throughput', store=True)
+    failure_message = fields.Text("Failure Reason", readonly=True)
+    error_limit_reached = fields.Boolean("Error Limit Reached", readonly=True,
+                                         help="The job stopped at the maximum number of errors, resuming it "
+                                              "would stop at the same row again")
+    import_log_ids = fields.One2many('tech.gear.import.log', 'job_id', string="Run Statistics", readonly=True)
+
+    @api.depends('rows_done', 'rows_total')
+    def _compute_progress(self):
+        for job in self:
+            job.progress = 100.0 * job.rows_done / job.rows_total if job.rows_total else 0.0
+
+    @api.depends('rows_done', 'duration')
+    def _compute_throughput(self):
+        for job in self:
+            job.throughput = job.rows_done / job.duration if job.duration else 0.0
+
+    def action_resume(self):
+        """
+        Queue failed jobs again. Processing continues after the last committed row. Jobs stopped by the error
+        limit are not resumed, the file must be corrected and imported again.
+        """
+        self.filtered(lambda job: job.state == 'failed' and not job.error_limit_reached).write(
+            {'state': 'pending', 'failure_message': False})
+        self._trigger_processing()
+
+    def _trigger_processing(self):
+        """Wake up the import cron instead of waiting for its next scheduled run."""
+        self.env.ref('tech_gear_inventory.ir_cron_process_import_jobs').sudo()._trigger()
+
+    @api.model
+    def _cron_process_jobs(self):
+        """
+        Process all pending jobs. Jobs left in the running state were interrupted (e.g. by a worker restart)
+        and are resumed from their last committed row. The cron itself never runs concurrently.
+        Each job runs as the user who queued it, so their access rights and record rules apply.
+        """
+        for job in self.search([('state', 'in', ('pending', 'running'))], order='id'):
+            job.with_user(job.create_uid)._process(auto_commit=True)
+
+    def _process(self, auto_commit=False):
+        """
+        Stream the job's file and import it chunk by chunk, recording progress after each chunk.
+        :param auto_commit: Commit after every chunk, disabled in tests which must not commit
+        """
+        self.ensure_one()
+        if self.skip_unchanged and self.last_row_index <= 1 and self._is_already_imported():
+            self.state = 'done'
+            return
+
+        statistics = ImportStatistics(self.env)
+        chunk_sizer = self._get_chunk_sizer(statistics)
+        category_manager = CategoryManager(self.env, statistics)
+        product_manager = ProductManager(self.env, fast_update=self.fast_update, skip_unchanged=self.skip_unchanged,
+                                         statistics=statistics)
+        error_log = ErrorLog(self.max_errors, groups=self.error_groups)
+        error_count = self.error_count
+        started = time.monotonic()
+
+        try:
+            try:
+                with self._open_excel_sheet(statistics) as sheet:
+                    self.write({'state': 'running', 'rows_total': max((sheet.max_row or 1) - 1, 0)})
+                    min_row = self.last_row_index + 1
+                    valid_rows = self._iter_valid_rows(sheet, error_log, min_row=min_row, statistics=statistics)
+                    if min_row > 2 and self.duplicate_policy != 'none':
+                        # Duplicates are collapsed over the whole file, including the rows already committed
+                        valid_rows = chain(self._iter_committed_rows(sheet, min_row), valid_rows)
+                    valid_rows = self._deduplicate_rows(valid_rows, statistics, min_row=min_row)
+                    for chunk in self._iter_chunks(valid_rows, lambda: chunk_sizer.size):
+                        with chunk_sizer.measure(len(chunk)):
+                            product_manager.batch_update_or_create(chunk, category_manager, error_log,
+                                                                   chunk_size=len(chunk))
+                        self._record_progress(chunk[-1].row_index, error_count, error_log, started)
+                        started = time.monotonic()
+                        if auto_commit:
+                            self.env.cr.commit()
+
+                # Rows after the last valid one can only have produced errors
+                self._record_progress(self.rows_total + 1, error_count, error_log, started)
+                self.state = 'done'
+            except ErrorLimitReached as e:
+                # The interrupted chunk counts as not processed, a resumed run starts after the last committed row
+                self._record_progress(self.last_row_index, error_count, error_log, started)
+                self.write({'state': 'failed', 'failure_message': str(e), 'error_limit_reached': True})
+
+            if error_log:
+                with statistics.measure('error_log', rows=len(error_log)):
+                    self._generate_error_log_file(error_log, append=True)
+            elif self.skip_unchanged and self.state == 'done' and not self.error_count:
+                self._remember_import()
+            self._create_import_log(statistics, product_manager, len(error_log), source='job', job_id=self.id)
+            if auto_commit:
+                self.env.cr.commit()
+        except Exception as e:
+            _logger.exception("Import job %s failed", self.name)
+            if not auto_commit:
+                raise
+            # Drop the partial chunk, everything up to the last committed row is kept for resuming
+            self.env.cr.rollback()
+            self.write({'state': 'failed', 'failure_message': str(e)})
+            self._create_import_log(statistics, product_manager, self.error_count - error_count,
+                                    source='job', job_id=self.id)
+            self.env.cr.commit()
+
+    def _iter_committed_rows(self, sheet, min_row):
+        """
+        Valid rows committed by previous runs, the rows before min_row. Their errors and statistics were
+        recorded by those runs and are discarded.
+        """
+        rows = self._iter_valid_rows(sheet, ErrorLog(), statistics=ImportStatistics(self.env))
+        return takewhile(lambda product_data: product_data.row_index < min_row, rows)
+
+    def _record_progress(self, last_row_index, error_count, error_log, started):
+        """
+        Store the progress made since the last commit on the job.
+        :param error_count: Error count of the job when the run started
+        :param error_log: ErrorLog of the run
+        """
+        last_row_index = max(last_row_index, self.last_row_index)
+        values = {
+            'last_row_index': last_row_index,
+            'rows_done': self.rows_done + last_row_index - self.last_row_index,
+            'duration': self.duration + time.monotonic() - started,
+        }
+        if error_log:
+            # Only the aggregated errors are stored per chunk, the lines are attached when the run ends
+            values['error_count'] = error_count + len(error_log)
+            values['error_groups'] = copy.deepcopy(error_log.groups)
+            values['error_summary'] = error_log.summary()
+        self.write(values)
@@ -0,0 +1,92 @@
+from odoo import api, models, fields, _
+
+IMPORT_PHASES = [
+    ('decode', 'Decoding'),
+    ('parse', 'Parsing'),
+    ('validation', 'Validation'),
+    ('deduplication', 'Duplicate Collapsing'),
+    ('categories', 'Category Resolution'),
+    ('lookup', 'Product Lookup'),
+    ('writes', 'Writes'),
+    ('error_log', 'Error Log Generation'),
+]
+
+
+class ImportLog(models.Model):
+    # Statistics of a single import run, from the wizard or a background job run. They show where the time of
+    # an import goes, which helps spotting regressions and sizing the chunk size from real data.
+
+    _name = 'tech.gear.import.log'
+    _description = 'Excel Import Statistics for Tech Gear Inventory'
+    _order = 'id desc'
+
+    source = fields.Selection([
+        ('wizard', 'Import Wizard'),
+        ('job', 'Background Job'),
+    ], string="Source", required=True, readonly=True)
+    job_id = fields.Many2one('tech.gear.import.job', string="Import Job", readonly=True, ondelete='set null')
+    user_id = fields.Many2one('res.users', string="User", readonly=True, default=lambda self: self.env.user)
+    chunk_size_mode = fields.Selection([
+        ('fixed', 'Fixed'),
+        ('auto', 'Auto'),
+    ], string="Chunk Sizing", readonly=True)
+    chunk_size = fields.Integer("Chunk Size", readonly=True, help="Chunk size settled on in auto chunk sizing")
+    chunk_count = fields.Integer("Chunks", readonly=True)
+    rows_read = fields.Integer("Rows Read", readonly=True)
+    rows_valid = fields.Integer("Valid Rows", readonly=True)
+    duplicate_policy = fields.Selection([
+        ('none', 'Import Every Row'),
+        ('last', 'Last Row Wins'),
+        ('first', 'First Row Wins'),
+        ('sum', 'Sum Quantities'),
+    ], string="Duplicate Rows", readonly=True)
+    duplicate_count = fields.Integer("Collapsed Duplicates", readonly=True)
+    duplicate_rows = fields.Char("Collapsed Rows", readonly=True, help="Sample of the collapsed row numbers")
+    created_count = fields.Integer("Created", readonly=True)
+    updated_count = fields.Integer("Updated", readonly=True)
+    unchanged_count = fields.Integer("Unchanged", readonly=True)
+    error_count = fields.Integer("Errors", readonly=True)
+    duration = fields.Float("Duration (s)", readonly=True)
+    query_count = fields.Integer("SQL Queries", readonly=True)
+    phase_ids = fields.One2many('tech.gear.import.log.phase', 'log_id', string="Phases", readonly=True)
+    summary = fields.Text("Summary", compute='_compute_summary')
+
+    @api.depends('rows_read', 'duration', 'created_count', 'updated_count', 'unchanged_count', 'error_count',
+                 'duplicate_count', 'duplicate_rows')
+    def _compute_summary(self):
+        for log in self:
+            log.summary = _(
+                "%(rows)d rows processed in %(duration).1fs: %(created)d created, %(updated)d updated, "
+                "%(unchanged)d unchanged, %(errors)d errors.",
+                rows=log.rows_read, duration=log.duration, created=log.created_count,
+                updated=log.updated_count, unchanged=log.unchanged_count, errors=log.error_count,
+            )
+            if log.duplicate_count:
+                log.summary += " " + _(
+                    "%(count)d duplicate rows collapsed (rows %(rows)s%(more)s).",
+                    count=log.duplicate_count, rows=log.duplicate_rows,
+                    more=", ..." if log.duplicate_count > len(log.duplicate_rows.split(",")) else "",
+                )
+
+    @api.depends('create_date', 'source')
+    def _compute_display_name(self):
+        for log in self:
+            log.display_name = _("Import of %s", log.create_date)
+
+
+class ImportLogPhase(models.Model):
+    _name = 'tech.gear.import.log.phase'
+    _description = 'Excel Import Phase Statistics for Tech Gear Inventory'
+    _order = 'log_id, id'
+
+    log_id = fields.Many2one('tech.gear.import.log', string="Import Log", required=True, ondelete='cascade')
+    phase = fields.Selection(IMPORT_PHASES, string="Phase", required=True)
+    seconds = fields.Float("Seconds")
+    queries = fields.Integer("SQL Queries")
+    rows = fields.Integer("Rows")
+    share = fields.Float("Share of Duration (%)", compute='_compute_share')
+
+    @api.depends('seconds', 'log_id.duration')
+    def _compute_share(self):
+        for phase in self:
+            phase.share = 100.0 * phase.seconds / phase.log_id.duration if phase.log_id.duration else 0.0
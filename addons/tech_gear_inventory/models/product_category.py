@@ -1,5 +1,82 @@
 # tech_gear_inventory/models/product_category.py
-from odoo import models, fields
+import threading
+from odoo import api, models, fields
+from odoo.tools import SQL, sql, str2bool
+from odoo.tools.lru import LRU
+
+# Index serving the Excel import lookups of categories by name
+NAME_INDEX = 'product_category_tech_gear_name_index'
+# System parameter making category names unique, applied when the module is installed or updated
+UNIQUE_NAMES_PARAM = 'tech_gear_inventory.unique_category_names'
+# Sequence versioning the category caches shared by the imports of each worker
+CACHE_VERSION_SEQUENCE = 'product_category_tech_gear_cache_version'
+
+
+class SharedCategoryCache:
+    """
+    Worker-level LRU cache mapping category names to their id and description, shared by all imports run
+    in the worker. Entries are only added once the transaction which read them is committed. The caches are
+    versioned by a database sequence, bumped by the hooks of product.category once a category creation,
+    rename or deletion is committed: every worker checks it with one query before using its cache and drops
+    the cache when the version moved.
+    """
+
+    def __init__(self, size=4096):
+        self.size = size
+        self._lock = threading.Lock()
+        self._caches = {}  # Database name to (category version, LRU)
+
+    def _get_lru(self, env):
+        """Return the LRU of the env's database, replaced when the category version changed."""
+        # is_called tells a new sequence from one bumped once, both have a last_value of 1
+        env.cr.execute(SQL("SELECT last_value, is_called FROM %s", SQL.identifier(CACHE_VERSION_SEQUENCE)))
+        version = env.cr.fetchone()
+        with self._lock:
+            cache = self._caches.get(env.cr.dbname)
+            if cache is None or cache[0] != version:
+                cache = self._caches[env.cr.dbname] = (version, LRU(self.size))
+            return cache[1]
+
+    def get_many(self, env, names):
+        """
+        :return: Dictionary mapping the cached names among the given ones to (id, description) tuples
+        """
+        lru = self._get_lru(env)
+        entries = {}
+        for name in names:
+            entry = lru.get(name)
+            if entry is not None:
+                entries[name] = entry
+        return entries
+
+    def add_many(self, env, entries):
+        """
+        Add (id, description) entries by name once the current transaction is committed, to the cache
+        returned by the last get_many. They are discarded if the cache is dropped in between, since they may
+        have been read before the change.
+        """
+        with self._lock:
+            cache = self._caches.get(env.cr.dbname)
+        if not entries or cache is None:
+            return
+        dbname, lru = env.cr.dbname, cache[1]
+
+        def add():
+            with self._lock:
+                cache = self._caches.get(dbname)
+            if cache is not None and cache[1] is lru:
+                for name, entry in entries.items():
+                    lru[name] = entry
+
+        env.cr.postcommit.add(add)
+
+    def invalidate(self, dbname):
+        with self._lock:
+            self._caches.pop(dbname, None)
+
+
+shared_category_cache = SharedCategoryCache()
+
 
 class ProductCategory(models.Model):
     # We inherit from product.category instead of creating a new model, since Odoo stock module already provides this
@@ -11,3 +88,71 @@ class ProductCategory(models.Model):
         string="Description",
         help="Description of the category"
     )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        categories = super().create(vals_list)
+        categories._invalidate_shared_category_cache()
+        return categories
+
+    def write(self, vals):
+        if 'name' in vals or 'description' in vals:
+            self._invalidate_shared_category_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self._invalidate_shared_category_cache()
+        return super().unlink()
+
+    def _invalidate_shared_category_cache(self):
+        """
+        Drop the import category cache of this worker, and bump the category version once the change is
+        committed so that all workers drop theirs. Bumping it earlier would let another worker cache the
+        categories before the change under the new version.
+        """
+        shared_category_cache.invalidate(self.env.cr.dbname)
+        postcommit = self.env.cr.postcommit
+        if not postcommit.data.get(CACHE_VERSION_SEQUENCE):
+            postcommit.data[CACHE_VERSION_SEQUENCE] = True
+            postcommit.add(self._bump_category_version)
+
+    def _bump_category_version(self):
+        with self.env.registry.cursor() as cr:
+            cr.execute(SQL("SELECT nextval(%s)", CACHE_VERSION_SEQUENCE))
+
+    def init(self):
+        super().init()
+        cr = self.env.cr
+        cr.execute(SQL("CREATE SEQUENCE IF NOT EXISTS %s", SQL.identifier(CACHE_VERSION_SEQUENCE)))
+        unique = str2bool(self.env['ir.config_parameter'].sudo().get_param(UNIQUE_NAMES_PARAM, 'False'))
+
+        # Recreate the index when the uniqueness option changed since it was created
+        cr.execute("SELECT indisunique FROM pg_index WHERE indexrelid = to_regclass(%s)", [NAME_INDEX])
+        existing = cr.fetchone()
+        if existing and existing[0] != unique:
+            sql.drop_index(cr, NAME_INDEX, self._table)
+            existing = None
+
+        if not existing and unique:
+            self._rename_duplicate_names()
+            sql.create_unique_index(cr, NAME_INDEX, self._table, ['name'])
+        elif not existing:
+            sql.create_index(cr, NAME_INDEX, self._table, ['name'])
+
+    def _rename_duplicate_names(self):
+        """
+        Make existing category names unique before the unique index is created. The category with the lowest
+        id keeps its name, it is the one the import resolves the name to, the others get their id appended.
+        """
+        self.flush_model(['name'])
+        self.env.cr.execute("""
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY name ORDER BY id) AS position FROM product_category
+            ) AS ranked
+            WHERE position > 1
+            ORDER BY id
+        """)
+        duplicate_ids = [row[0] for row in self.env.cr.fetchall()]
+        for category in self.with_context(active_test=False).browse(duplicate_ids):
+            category.name = "%s (%s)" % (category.name, category.id)
+        self.flush_model(['name'])
@@ -1,5 +1,12 @@
 # tech_gear_inventory/models/product_template.py
 from odoo import models, fields
+from odoo.tools import sql
+
+# Fields covered by the import hash of a product
+IMPORT_HASH_FIELDS = ('name', 'categ_id', 'price', 'quantity')
+# Index serving the Excel import lookups of products by name and category. The name is translatable and
+# stored as jsonb, the import looks it up in en_US so that its condition matches the indexed expression.
+IMPORT_KEY_INDEX = 'product_template_tech_gear_import_key_index'
 
 class ProductTemplate(models.Model):
     # Here we inherit from product.template model. For the field mapping:
@@ -22,3 +29,19 @@ class ProductTemplate(models.Model):
         string="Quantity",
         help="Quantity of the product"
     )
+    # Hash of the content last written by the Excel import, used to skip unchanged rows on re-imports.
+    # It is cleared whenever the hashed fields are changed by anything else than the importer.
+    import_hash = fields.Char(
+        string="Import Hash",
+        copy=False,
+        readonly=True
+    )
+
+    def init(self):
+        super().init()
+        sql.create_index(self.env.cr, IMPORT_KEY_INDEX, self._table, ["(name->>'en_US')", 'categ_id'])
+
+    def write(self, vals):
+        if 'import_hash' not in vals and any(field in vals for field in IMPORT_HASH_FIELDS):
+            vals = dict(vals, import_hash=False)
+        return super().write(vals)
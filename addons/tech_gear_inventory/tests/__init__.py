@@ -1,2 +1,5 @@
 # tech_gear_inventory/tests/__init__.py
 from . import test_excel_import
+from . import test_import_job
+from . import test_excel_export
+from . import test_import_benchmark
@@ -0,0 +1,90 @@
+import base64
+from io import BytesIO
+import openpyxl
+from odoo.tests import HttpCase, TransactionCase, tagged
+from odoo.addons.tech_gear_inventory.models.excel_export_wizard import SHEET_HEADER
+
+
+class TestExcelExport(TransactionCase):
+    def setUp(self):
+        """Set up products in two categories."""
+        super(TestExcelExport, self).setUp()
+        self.category_a = self.env['product.category'].create({'name': "Export Category A"})
+        self.category_b = self.env['product.category'].create({'name': "Export Category B"})
+        self.env['product.template'].create([
+            {'name': f"Export Product {index}", 'categ_id': category.id, 'price': index * 1.5, 'quantity': index}
+            for index, category in enumerate([self.category_a] * 5 + [self.category_b] * 2)
+        ])
+
+    def _export(self, **values):
+        """:return: Tuple of the base64-encoded export, its product count and its rows"""
+        wizard = self.env['tech.gear.excel.export.wizard'].create(values)
+        file = BytesIO()
+        product_count = wizard._write_workbook(file)
+        workbook = openpyxl.load_workbook(BytesIO(file.getvalue()), read_only=True)
+        return base64.b64encode(file.getvalue()), product_count, list(workbook.active.iter_rows(values_only=True))
+
+    def test_export(self):
+        """Test that products are exported page by page in the import layout."""
+        _file, product_count, rows = self._export(category_ids=[(6, 0, [self.category_a.id])], batch_size=2)
+
+        self.assertEqual(rows[0], SHEET_HEADER, "Header should match the import layout.")
+        self.assertEqual(product_count, 5, "Only products of the selected category should be exported.")
+        self.assertEqual(rows[1:], [(f"Export Product {index}", "Export Category A", index * 1.5, index)
+                                    for index in range(5)], "Exported rows mismatch.")
+
+    def test_export_round_trip(self):
+        """Test that importing an exported sheet matches every product and leaves its values unchanged."""
+        file, _product_count, rows = self._export(category_ids=[(6, 0, [self.category_a.id, self.category_b.id])])
+
+        import_wizard = self.env['tech.gear.excel.import.wizard'].create({'file': file})
+        import_wizard.action_preview()
+        self.assertEqual(import_wizard.preview_update_count, 7, "Every exported product should be matched.")
+        self.assertEqual(import_wizard.preview_create_count, 0, "Nothing should be created.")
+        self.assertEqual(import_wizard.preview_error_count, 0, "Exported rows should be valid.")
+
+        import_wizard.import_excel()
+        self.assertEqual(self._export(category_ids=[(6, 0, [self.category_a.id, self.category_b.id])])[2], rows,
+                         "Importing the export should not change any product.")
+        # Imported products now carry their import hash, importing the sheet again leaves them unchanged
+        import_wizard.action_preview()
+        self.assertEqual(import_wizard.preview_unchanged_count, 7, "Every exported product should be unchanged.")
+
+    def test_export_translated_names(self):
+        """Test that names are exported in en_US, the language the import matches them in."""
+        self.env['res.lang']._activate_lang('fr_FR')
+        product = self.env['product.template'].search([('name', '=', "Export Product 0")])
+        product.with_context(lang='fr_FR').name = "Produit Exporté 0"
+        self.env = self.env(context=dict(self.env.context, lang='fr_FR'))
+
+        file, _product_count, rows = self._export(category_ids=[(6, 0, [self.category_a.id])])
+
+        self.assertEqual(rows[1][0], "Export Product 0", "Names should be exported in en_US.")
+        import_wizard = self.env['tech.gear.excel.import.wizard'].create({'file': file})
+        import_wizard.action_preview()
+        self.assertEqual(import_wizard.preview_update_count, 5, "Translated products should be matched.")
+        self.assertEqual(import_wizard.preview_create_count, 0, "Translated products should not be created again.")
+
+
+@tagged('post_install', '-at_install')
+class TestExcelExportDownload(HttpCase):
+    def test_export_download(self):
+        """Test that the export route streams the workbook of a wizard."""
+        category = self.env['product.category'].create({'name': "Download Category"})
+        self.env['product.template'].create({
+            'name': "Download Product", 'categ_id': category.id, 'price': 2.5, 'quantity': 3
+        })
+        wizard = self.env['tech.gear.excel.export.wizard'].with_user(self.env.ref('base.user_admin')).create({
+            'category_ids': [(6, 0, [category.id])],
+        })
+        self.authenticate('admin', 'admin')
+
+        response = self.url_open(wizard.action_export()['url'])
+
+        self.assertEqual(response.status_code, 200, "Export should be downloaded.")
+        self.assertIn('products.xlsx', response.headers['Content-Disposition'], "Filename mismatch.")
+        workbook = openpyxl.load_workbook(BytesIO(response.content), read_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(rows, [SHEET_HEADER, ("Download Product", "Download Category", 2.5, 3)], "Rows mismatch.")
+        wizard.invalidate_recordset()
+        self.assertEqual(wizard.product_count, 1, "Exported products should be counted.")
@@ -1,10 +1,17 @@
 import base64
+import gzip
 import os
 import re
 from io import BytesIO
+import openpyxl
 from odoo.tests import TransactionCase
 from odoo.exceptions import ValidationError
-from odoo.addons.tech_gear_inventory.models.excel_import_wizard import ProductData, CategoryManager, ProductManager
+from openpyxl.utils.datetime import CALENDAR_WINDOWS_1900
+from odoo.addons.tech_gear_inventory.models.excel_import_wizard import (
+    ChunkSizer, ErrorLimitReached, ErrorLog, ProductData, CategoryManager, ProductManager, ROW_START_PATTERN,
+    _init_parse_worker, _parse_sheet_segment, iter_sheet_segments,
+)
+from odoo.addons.tech_gear_inventory.models.product_category import shared_category_cache
 
 class TestExcelImport(TransactionCase):
     def setUp(self):
@@ -49,6 +56,27 @@ class TestExcelImport(TransactionCase):
                                                            "missing name to be invalid.")
         self.assertIn("Row 5: Missing 'Product Name' or 'Category'.", error_log[-1])
 
+    def test_product_data_validate_rows(self):
+        """Test that column-wise block validation matches row by row validation."""
+        rows = [
+            ("Valid Product", "Valid Category", 100.0, 10),
+            ("Invalid Product", None, "ABC", 10),
+            (None, "Valid Category", 75, "XYZ"),
+            ("Another Product", "Valid Category", 5, 1),
+        ]
+        row_indexes = [2, 3, 5, 6]
+
+        error_log = []
+        valid_rows = ProductData.validate_rows(rows, row_indexes, error_log)
+
+        expected_log = []
+        expected = [ProductData(*row, row_index) for row, row_index in zip(rows, row_indexes)]
+        expected = [product_data for product_data in expected if product_data.validate(expected_log)]
+        self.assertEqual(error_log, expected_log, "Errors should match row by row validation, in sheet order.")
+        self.assertEqual([(data.product_name, data.row_index) for data in valid_rows],
+                         [(data.product_name, data.row_index) for data in expected], "Valid rows mismatch.")
+        self.assertFalse(hasattr(valid_rows[0], '__dict__'), "Rows should not carry a per-instance dictionary.")
+
     def test_category_manager_get_or_create(self):
         """Test the get_or_create method of CategoryManager with caching and description updates."""
         # Create category initially
@@ -64,6 +92,115 @@ class TestExcelImport(TransactionCase):
         cached_category = self.category_manager.get_or_create("Update Category", "Updated Description")
         self.assertEqual(updated_category.id, cached_category.id, "Expected cached category ID to match updated ID.")
 
+    def test_category_manager_prefetch(self):
+        """Test that prefetch resolves, creates and updates categories in bulk and fills the cache."""
+        existing = self.env['product.category'].create({'name': "Prefetch Existing", 'description': "Old"})
+
+        self.category_manager.prefetch({
+            "Prefetch Existing": "New",
+            "Prefetch Missing": "Prefetch Missing",
+        })
+
+        created = self.env['product.category'].search([('name', '=', "Prefetch Missing")])
+        self.assertEqual(len(created), 1, "Missing category should be created exactly once.")
+        self.assertEqual(existing.description, "New", "Existing category description should be updated.")
+        self.assertEqual(self.category_manager.category_cache["Prefetch Existing"], existing,
+                         "Existing category should be cached.")
+        self.assertEqual(self.category_manager.category_cache["Prefetch Missing"], created,
+                         "Created category should be cached.")
+
+        # Cached categories with unchanged descriptions must not hit the database again
+        self.env.flush_all()
+        start = self.env.cr.sql_log_count
+        self.category_manager.get_or_create("Prefetch Missing", "Prefetch Missing")
+        self.category_manager.prefetch({"Prefetch Existing": "New"})
+        self.assertEqual(self.env.cr.sql_log_count, start, "Cached categories should not trigger queries.")
+
+    def test_category_prefetch_query_count(self):
+        """Test that resolving existing categories costs the same number of queries regardless of their count."""
+        def count_prefetch_queries(prefix, count):
+            category_manager = CategoryManager(self.env)
+            names = {f"{prefix} {index}": f"{prefix} {index}" for index in range(count)}
+            self.env['product.category'].create([{'name': name, 'description': "Old"} for name in names])
+            self.env.flush_all()
+            self.env.invalidate_all()
+            start = self.env.cr.sql_log_count
+            category_manager.prefetch(names)
+            self.env.flush_all()
+            return self.env.cr.sql_log_count - start
+
+        self.assertEqual(count_prefetch_queries("Few Categories", 2), count_prefetch_queries("Many Categories", 30),
+                         "Category prefetch query count grows with the number of categories.")
+
+    def test_shared_category_cache(self):
+        """Test that committed categories are shared with later imports and dropped when categories change."""
+        self.addCleanup(shared_category_cache.invalidate, self.env.cr.dbname)
+        category = self.env['product.category'].create({'name': "Shared Category", 'description': "Shared"})
+        self.env.cr.postcommit.run()  # Stands for the commit of the transaction
+
+        CategoryManager(self.env).prefetch({"Shared Category": "Shared"})
+        self.assertFalse(shared_category_cache.get_many(self.env, ["Shared Category"]),
+                         "Categories should only be shared once committed.")
+        self.env.cr.postcommit.run()
+        self.assertEqual(shared_category_cache.get_many(self.env, ["Shared Category"]),
+                         {"Shared Category": (category.id, "Shared")}, "Committed categories should be shared.")
+
+        # A later import resolves the category with the version check as only query
+        category_manager = CategoryManager(self.env)
+        self.env.flush_all()
+        start = self.env.cr.sql_log_count
+        category_manager.prefetch({"Shared Category": "Shared"})
+        self.assertEqual(self.env.cr.sql_log_count, start + 1, "Shared categories should not be queried.")
+        self.assertEqual(category_manager.category_cache["Shared Category"], category,
+                         "Shared category should be resolved.")
+
+        # Unrelated cache invalidations, like the fingerprint of the last import, keep the shared cache
+        self.env['ir.config_parameter'].sudo().set_param('tech_gear_inventory.last_import_fingerprint', "test")
+        self.assertTrue(shared_category_cache.get_many(self.env, ["Shared Category"]),
+                        "Unrelated changes should not drop the shared cache.")
+
+        # A category change committed by another worker bumps the version
+        self.env.cr.execute("SELECT nextval('product_category_tech_gear_cache_version')")
+        self.assertFalse(shared_category_cache.get_many(self.env, ["Shared Category"]),
+                         "A new category version should drop the shared cache.")
+        CategoryManager(self.env).prefetch({"Shared Category": "Shared"})
+        self.env.cr.postcommit.run()
+
+        category.name = "Renamed Shared Category"
+        self.assertFalse(shared_category_cache.get_many(self.env, ["Shared Category"]),
+                         "Renaming a category should drop the shared cache.")
+        self.env.cr.postcommit.run()
+
+        CategoryManager(self.env).prefetch({"Renamed Shared Category": "Shared"})
+        self.env.cr.postcommit.run()
+        self.assertTrue(shared_category_cache.get_many(self.env, ["Renamed Shared Category"]),
+                        "Renamed category should be shared once committed.")
+        category.unlink()
+        self.assertFalse(shared_category_cache.get_many(self.env, ["Renamed Shared Category"]),
+                         "Deleting a category should drop the shared cache.")
+
+    def test_import_key_indexes(self):
+        """Test the lookup indexes and that unique category names rename existing duplicates."""
+        def index_is_unique(index_name):
+            self.env.cr.execute("SELECT indisunique FROM pg_index WHERE indexrelid = to_regclass(%s)", [index_name])
+            row = self.env.cr.fetchone()
+            return row and row[0]
+
+        self.assertIs(index_is_unique('product_template_tech_gear_import_key_index'), False,
+                      "Product lookup index should exist.")
+        self.assertIs(index_is_unique('product_category_tech_gear_name_index'), False,
+                      "Category name index should exist and not be unique by default.")
+
+        first = self.env['product.category'].create({'name': "Duplicate Category"})
+        second = self.env['product.category'].create({'name': "Duplicate Category"})
+        self.env['ir.config_parameter'].sudo().set_param('tech_gear_inventory.unique_category_names', 'True')
+        self.env['product.category'].init()
+
+        self.assertIs(index_is_unique('product_category_tech_gear_name_index'), True,
+                      "Category name index should become unique.")
+        self.assertEqual(first.name, "Duplicate Category", "The lowest id should keep its name.")
+        self.assertEqual(second.name, f"Duplicate Category ({second.id})", "Duplicates should be renamed.")
+
     def test_product_manager_batch_update_or_create(self):
         """Test the batch_update_or_create method of ProductManager with chunked batch processing."""
         # Prepare sample product data
@@ -93,6 +230,204 @@ class TestExcelImport(TransactionCase):
         # Verify no errors
         self.assertFalse(error_log, f"Unexpected errors found: {error_log}")
 
+    def test_product_lookup_query_count_per_chunk(self):
+        """Test that existing products of a chunk are resolved with a bounded number of queries."""
+        category = self.category_manager.get_or_create("Lookup Category", "Lookup Category")
+        products = self.env['product.template'].create([
+            {'name': f"Lookup Product {index}", 'categ_id': category.id, 'price': 1.0, 'quantity': 1}
+            for index in range(20)
+        ])
+        self.env.flush_all()
+
+        def count_lookup_queries(keys):
+            start = self.env.cr.sql_log_count
+            product_index = self.product_manager.fetch_existing_products(keys)
+            return self.env.cr.sql_log_count - start, product_index
+
+        small_count, small_index = count_lookup_queries(
+            [(product.name, category.id) for product in products[:2]])
+        large_count, large_index = count_lookup_queries(
+            [(product.name, category.id) for product in products])
+
+        self.assertEqual(len(small_index), 2, "Expected both products to be found.")
+        self.assertEqual(len(large_index), 20, "Expected all products to be found.")
+        self.assertEqual(large_index[("Lookup Product 5", category.id)], products[5].id,
+                         "Product index points to the wrong record.")
+        self.assertEqual(small_count, large_count, "Product lookup query count grows with the chunk size.")
+
+    def test_product_manager_batch_update_existing(self):
+        """Test that existing products are updated instead of duplicated."""
+        category = self.category_manager.get_or_create("Existing Category", "Existing Category")
+        product = self.env['product.template'].create({
+            'name': "Existing Product", 'categ_id': category.id, 'price': 10.0, 'quantity': 1
+        })
+
+        error_log = []
+        self.product_manager.batch_update_or_create(
+            [ProductData("Existing Product", "Existing Category", 20.0, 3, 2),
+             ProductData("New Product", "Existing Category", 5.0, 7, 3)],
+            self.category_manager, error_log, chunk_size=10)
+
+        self.assertFalse(error_log, f"Unexpected errors found: {error_log}")
+        self.assertEqual(product.price, 20.0, "Existing product price was not updated.")
+        self.assertEqual(product.quantity, 3, "Existing product quantity was not updated.")
+        self.assertEqual(self.env['product.template'].search_count([('name', '=', 'Existing Product')]), 1,
+                         "Existing product was duplicated.")
+        self.assertTrue(self.env['product.template'].search([('name', '=', 'New Product')]),
+                        "New product was not created.")
+
+    def test_product_manager_create_failure_isolation(self):
+        """Test that a failing row of a bulk create only rejects itself, with its own row number."""
+        error_log = []
+        products_data = [ProductData(f"Isolated Product {index}", "Isolated Category", 1.0, 1, index)
+                         for index in range(2, 10)]
+        # Out of the integer column range, only fails when the chunk is written to the database
+        products_data[3].quantity = 10 ** 12
+
+        self.product_manager.batch_update_or_create(products_data, self.category_manager, error_log,
+                                                    chunk_size=len(products_data))
+
+        self.assertEqual(len(error_log), 1, f"Only the failing row should be rejected: {error_log}")
+        self.assertIn("Failed to create product 'Isolated Product 5' in row 5", error_log[0])
+        self.assertEqual(self.product_manager.created_count, 7, "Valid rows of the chunk should be created.")
+        self.assertEqual(self.env['product.template'].search_count([('name', '=like', 'Isolated Product %')]), 7,
+                         "Valid rows of the chunk should be stored.")
+
+    def test_fast_update_access_rights(self):
+        """Test that the SQL fast path does not let a user change products they may not write."""
+        category = self.category_manager.get_or_create("Restricted Category", "Restricted Category")
+        product = self.env['product.template'].create({
+            'name': "Restricted Product", 'categ_id': category.id, 'price': 1.0, 'quantity': 1
+        })
+        user = self.env['res.users'].create({
+            'name': "Restricted User",
+            'login': 'tech_gear_restricted_user',
+            'groups_id': [(6, 0, [self.env.ref('base.group_user').id])],
+        })
+        # Internal users may write products, a record rule takes that right away for this product
+        self.env['ir.rule'].create({
+            'name': "Restricted product",
+            'model_id': self.env.ref('product.model_product_template').id,
+            'domain_force': f"[('id', '!=', {product.id})]",
+            'groups': [(6, 0, [self.env.ref('base.group_user').id])],
+            'perm_read': False,
+            'perm_write': True,
+            'perm_create': False,
+            'perm_unlink': False,
+        })
+        user_env = self.env(user=user)
+        product_manager = ProductManager(user_env, fast_update=True)
+        self.assertTrue(product_manager.fast_update, "Price and quantity should qualify for the fast path.")
+
+        error_log = []
+        product_manager.batch_update_or_create([ProductData("Restricted Product", "Restricted Category", 2.0, 3, 2)],
+                                               CategoryManager(user_env), error_log)
+
+        self.assertEqual((product.price, product.quantity), (1.0, 1), "Product without write access was updated.")
+        self.assertEqual(len(error_log), 1, "The rejected update should be logged.")
+
+    def test_update_keeps_translations(self):
+        """Test that updating products as a non-en_US user keeps the names translated in the user's language."""
+        self.env['res.lang']._activate_lang('fr_FR')
+        category = self.category_manager.get_or_create("Translated Category", "Translated Category")
+        product = self.env['product.template'].create({
+            'name': "Translated Product", 'categ_id': category.id, 'price': 1.0, 'quantity': 1
+        })
+        product.with_context(lang='fr_FR').name = "Produit Traduit"
+
+        fr_env = self.env(context=dict(self.env.context, lang='fr_FR'))
+        error_log = []
+        ProductManager(fr_env).batch_update_or_create([ProductData("Translated Product", "Translated Category",
+                                                                   2.0, 3, 2)], CategoryManager(fr_env), error_log)
+
+        self.assertFalse(error_log, f"Unexpected errors found: {error_log}")
+        self.assertEqual((product.price, product.quantity), (2.0, 3), "Product should be updated.")
+        self.assertEqual(product.with_context(lang='fr_FR').name, "Produit Traduit", "Translation was overwritten.")
+        self.assertEqual(product.with_context(lang='en_US').name, "Translated Product", "en_US name mismatch.")
+
+    def test_product_manager_fast_update(self):
+        """Test that the SQL fast path updates price and quantity and invalidates the ORM cache."""
+        product_manager = ProductManager(self.env, fast_update=True)
+        self.assertTrue(product_manager.fast_update, "Price and quantity should qualify for the fast path.")
+
+        category = self.category_manager.get_or_create("Fast Category", "Fast Category")
+        products = self.env['product.template'].create([
+            {'name': f"Fast Product {index}", 'categ_id': category.id, 'price': 1.0, 'quantity': 1}
+            for index in range(10)
+        ])
+        # Load the old values in the cache to check they are invalidated, variants inherit them
+        self.assertEqual(products.mapped('price'), [1.0] * 10)
+        self.assertEqual(products.product_variant_ids.mapped('quantity'), [1] * 10)
+
+        def count_update_queries(rows):
+            self.env.flush_all()
+            start = self.env.cr.sql_log_count
+            error_log = []
+            product_manager.batch_update_or_create(rows, self.category_manager, error_log, chunk_size=len(rows))
+            self.assertFalse(error_log, f"Unexpected errors found: {error_log}")
+            return self.env.cr.sql_log_count - start
+
+        small_count = count_update_queries([
+            ProductData(product.name, "Fast Category", 2.0, 2, index + 2) for index, product in enumerate(products[:2])
+        ])
+        large_count = count_update_queries([
+            ProductData(product.name, "Fast Category", 3.5, 4, index + 2) for index, product in enumerate(products)
+        ])
+
+        self.assertEqual(products.mapped('price'), [3.5] * 10, "Price was not updated by the fast path.")
+        self.assertEqual(products.mapped('quantity'), [4] * 10, "Quantity was not updated by the fast path.")
+        self.assertEqual(products.product_variant_ids.mapped('quantity'), [4] * 10,
+                         "Inherited quantity of the variants should be invalidated.")
+        self.assertEqual(small_count, large_count, "Fast update query count grows with the number of products.")
+
+    def test_skip_unchanged_rows(self):
+        """Test that rows whose content is already stored are dropped before any write."""
+        product_manager = ProductManager(self.env, skip_unchanged=True)
+        rows = [ProductData("Delta Product A", "Delta Category", 10.0, 1, 2),
+                ProductData("Delta Product B", "Delta Category", 20.0, 2, 3)]
+        error_log = []
+        product_manager.batch_update_or_create(rows, self.category_manager, error_log)
+        product_a = self.env['product.template'].search([('name', '=', 'Delta Product A')])
+        self.assertTrue(product_a.import_hash, "Imported products should store their content hash.")
+
+        # Re-import the same content, with an integer price which is stored identically
+        product_manager.batch_update_or_create(
+            [ProductData("Delta Product A", "Delta Category", 10, 1, 2),
+             ProductData("Delta Product B", "Delta Category", 25.0, 2, 3)],
+            self.category_manager, error_log)
+        self.assertFalse(error_log, f"Unexpected errors found: {error_log}")
+        self.assertEqual(product_manager.unchanged_count, 1, "Only the identical row should be skipped.")
+        product_b = self.env['product.template'].search([('name', '=', 'Delta Product B')])
+        self.assertEqual(product_b.price, 25.0, "Changed row should still be updated.")
+
+        # A manual edit clears the hash so the next import restores the imported values
+        product_a.write({'price': 99.0})
+        self.assertFalse(product_a.import_hash, "Manual edits should clear the import hash.")
+        product_manager.batch_update_or_create([ProductData("Delta Product A", "Delta Category", 10.0, 1, 2)],
+                                               self.category_manager, error_log)
+        self.assertEqual(product_a.price, 10.0, "Manually edited product should be updated again.")
+
+    def test_skip_unchanged_file(self):
+        """Test that re-uploading the last imported file returns immediately."""
+        with open(self.test_file_path, 'rb') as file:
+            encoded_file = base64.b64encode(file.read())
+
+        wizard = self.env['tech.gear.excel.import.wizard'].create({'file': encoded_file})
+        self.assertFalse(wizard._is_already_imported(), "A new file should not be considered imported.")
+        wizard._remember_import()
+        self.assertTrue(wizard._is_already_imported(), "The last imported file should be recognised.")
+        action = wizard.import_excel()
+        self.assertEqual(action['params']['title'], "Nothing to Import", "Re-upload should return immediately.")
+
+        # Another duplicate policy may import the same file differently
+        sum_wizard = self.env['tech.gear.excel.import.wizard'].create({'file': encoded_file, 'duplicate_policy': 'sum'})
+        self.assertFalse(sum_wizard._is_already_imported(), "A new duplicate policy should invalidate the fingerprint.")
+
+        # Any catalog change invalidates the file fingerprint
+        self.product_manager.batch_update_or_create([ProductData("Fingerprint Product", "Fingerprint Category",
+                                                                 10.0, 1, 2)], self.category_manager, [])
+        self.assertFalse(wizard._is_already_imported(), "Catalog changes should invalidate the fingerprint.")
+
     import re
 
     def test_excel_import(self):
@@ -111,7 +446,7 @@ class TestExcelImport(TransactionCase):
         try:
             wizard.import_excel()
         except ValidationError as e:
-            error_log_file = BytesIO(base64.b64decode(wizard.error_log_file))
+            error_log_file = BytesIO(gzip.decompress(base64.b64decode(wizard.error_log_file)))
             error_log_content = error_log_file.read().decode('utf-8')
             self.fail(f"Import failed with ValidationError: {str(e)}\nError Log:\n{error_log_content}")
 
@@ -124,7 +459,7 @@ class TestExcelImport(TransactionCase):
 
         # Verify error logging for invalid rows dynamically
         if wizard.error_log_file:
-            error_log_file = BytesIO(base64.b64decode(wizard.error_log_file))
+            error_log_file = BytesIO(gzip.decompress(base64.b64decode(wizard.error_log_file)))
             error_log_content = error_log_file.read().decode('utf-8')
 
             # Define patterns to look for specific error types
@@ -135,6 +470,234 @@ class TestExcelImport(TransactionCase):
             self.assertRegex(error_log_content, price_error_pattern, "Price error log entry missing.")
             self.assertRegex(error_log_content, missing_data_pattern, "Missing data error log entry missing.")
 
+    def test_iter_chunks(self):
+        """Test that rows are grouped into chunks lazily without materialising the source."""
+        wizard = self.env['tech.gear.excel.import.wizard']
+        rows = (index for index in range(5))
+        chunks = wizard._iter_chunks(rows, 2)
+
+        self.assertEqual(next(chunks), [0, 1], "First chunk mismatch.")
+        self.assertEqual(next(rows), 2, "Chunking should not consume rows ahead of the current chunk.")
+        self.assertEqual(list(chunks), [[3, 4]], "Remaining chunks mismatch.")
+
+    def test_adaptive_chunk_size(self):
+        """Test that auto chunk sizing grows fast chunks and shrinks slow ones towards the target duration."""
+        sizer = ChunkSizer(self.env, 100, adaptive=True, target_duration=1.0)
+        self.assertEqual(sizer.size, ChunkSizer.INITIAL_SIZE, "Auto chunk sizing should start small.")
+
+        # Fast chunks grow by at most the step factor per chunk
+        sizer.observe(50, 0.05, 10, 0)
+        self.assertEqual(sizer.size, 100, "A fast chunk should double the chunk size.")
+        for _index in range(20):
+            sizer.observe(sizer.size, sizer.size * 0.001, 10, 0)
+        self.assertEqual(sizer.size, 1000, "Chunk size should settle on the target duration.")
+
+        # Slow chunks and large memory growth shrink it
+        sizer.observe(sizer.size, 10.0, 10, 0)
+        self.assertLess(sizer.size, 1000, "A slow chunk should shrink the chunk size.")
+        size = sizer.size
+        sizer.observe(size, 0.001, 10, ChunkSizer.MEMORY_BUDGET + 1)
+        self.assertLessEqual(sizer.size, size // 2, "Memory growth should halve the chunk size.")
+        self.assertEqual(sizer.statistics.chunk_size, sizer.size, "Settled size should be reported.")
+
+        # Fixed chunk sizing never changes
+        fixed_sizer = ChunkSizer(self.env, 100)
+        fixed_sizer.observe(100, 100.0, 10, 0)
+        self.assertEqual(fixed_sizer.size, 100, "Fixed chunk size should not change.")
+
+        sizes = iter([1, 2, 3, 4])
+        chunks = list(self.env['tech.gear.excel.import.wizard']._iter_chunks(range(6), lambda: next(sizes)))
+        self.assertEqual(chunks, [[0], [1, 2], [3, 4, 5]], "Chunks should follow the chunk size callable.")
+
+    def test_open_excel_sheet_streaming(self):
+        """Test that the spooled workbook is opened in read-only mode and yields the sheet rows."""
+        with open(self.test_file_path, 'rb') as file:
+            encoded_file = base64.b64encode(file.read())
+        wizard = self.env['tech.gear.excel.import.wizard'].create({'file': encoded_file})
+
+        error_log = []
+        with wizard._open_excel_sheet() as sheet:
+            valid_rows = list(wizard._iter_valid_rows(sheet, error_log))
+
+        self.assertEqual([row.product_name for row in valid_rows], ["Sample Product A", "Sample Product B"],
+                         "Valid rows mismatch.")
+        self.assertEqual(len(error_log), 4, f"Unexpected errors found: {error_log}")
+
+    def test_parallel_parsing(self):
+        """Test that parsing in a capped process pool yields the same rows and errors as sequential parsing."""
+        with open(self.test_file_path, 'rb') as file:
+            encoded_file = base64.b64encode(file.read())
+
+        # The cap defaults to the CPU count, which may be 1
+        self.env['ir.config_parameter'].sudo().set_param('tech_gear_inventory.max_parse_workers', 2)
+
+        def parse(parse_workers):
+            wizard = self.env['tech.gear.excel.import.wizard'].create({
+                'file': encoded_file,
+                'parse_workers': parse_workers,
+            })
+            error_log = []
+            with wizard._open_excel_sheet() as sheet:
+                rows = [(row.product_name, row.category_name, row.price, row.quantity, row.row_index)
+                        for row in wizard._iter_valid_rows(sheet, error_log)]
+            return rows, error_log
+
+        self.assertEqual(parse(2), parse(0), "Parallel parsing should match sequential parsing.")
+
+        with self.assertRaises(ValidationError):
+            self.env['tech.gear.excel.import.wizard'].create({'file': encoded_file, 'parse_workers': 3})
+
+    def test_parse_sheet_segments(self):
+        """Test that a sheet split into many segments is parsed with the right row numbers and in order."""
+        header = ["Product Name", "Category", "Price", "Quantity"]
+        sheet_rows = [header] + [
+            [] if index % 11 == 0 else
+            [f"Segment Product {index}", "Segment Category", "abc" if index % 7 == 0 else index * 1.5, index]
+            for index in range(1, 61)
+        ]
+
+        def sheet_xml(numbered):
+            """Worksheet XML with shared strings, with or without the optional r attributes."""
+            shared_strings = []
+            xml_rows = []
+            for row_index, row in enumerate(sheet_rows, start=1):
+                cells = []
+                for column, value in zip("ABCD", row):
+                    reference = f' r="{column}{row_index}"' if numbered else ''
+                    if isinstance(value, str):
+                        shared_strings.append(value)
+                        cells.append(f'<c{reference} t="s"><v>{len(shared_strings) - 1}</v></c>')
+                    else:
+                        cells.append(f'<c{reference}><v>{value}</v></c>')
+                row_reference = f' r="{row_index}"' if numbered else ''
+                xml_rows.append(f'<row{row_reference}>{"".join(cells)}</row>')
+            xml = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                   '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                   f'<sheetData>{"".join(xml_rows)}</sheetData></worksheet>')
+            return xml.encode('utf-8'), shared_strings
+
+        def parse(xml, segment_size):
+            segments = iter_sheet_segments(BytesIO(xml), segment_size=segment_size)
+            worksheet_tag = next(segments)
+            rows, errors, segment_count = [], [], 0
+            first_row = 1
+            for segment in segments:
+                columns, segment_errors, _rows_read = _parse_sheet_segment(worksheet_tag, segment, first_row, 2)
+                rows += zip(*columns)
+                errors += segment_errors
+                first_row += len(ROW_START_PATTERN.findall(segment))
+                segment_count += 1
+            return rows, errors, segment_count
+
+        expected_errors = []
+        row_indexes = [index for index, row in enumerate(sheet_rows, start=1) if row and index > 1]
+        expected_rows = [
+            (row.product_name, row.category_name, row.price, row.quantity, row.row_index)
+            for row in ProductData.validate_rows([sheet_rows[index - 1] for index in row_indexes], row_indexes,
+                                                 expected_errors)
+        ]
+        for numbered in (True, False):
+            with self.subTest(numbered=numbered):
+                xml, shared_strings = sheet_xml(numbered)
+                _init_parse_worker(shared_strings, CALENDAR_WINDOWS_1900, set(), set())
+                rows, errors, segment_count = parse(xml, 256)
+                self.assertGreater(segment_count, 5, "The sheet should be split into many segments.")
+                self.assertEqual(rows, expected_rows, "Segmented parsing should keep row numbers and order.")
+                self.assertEqual(errors, expected_errors, "Segmented parsing should report the same errors.")
+                self.assertEqual(parse(xml, len(xml))[:2], (rows, errors),
+                                 "Segmented parsing should match parsing a single segment.")
+
+    def test_import_statistics(self):
+        """Test that an import records its counters and per-phase statistics on an import log."""
+        with open(self.test_file_path, 'rb') as file:
+            wizard = self.env['tech.gear.excel.import.wizard'].create({
+                'file': base64.b64encode(file.read()),
+                'chunk_size': 1,
+            })
+
+        wizard.import_excel()
+
+        log = wizard.import_log_id
+        self.assertTrue(log, "Import should record its statistics.")
+        self.assertEqual(log.source, 'wizard', "Log source mismatch.")
+        self.assertEqual(log.rows_read, 4, "All data rows should be counted.")
+        self.assertEqual(log.rows_valid, 2, "Only valid rows should be counted as valid.")
+        self.assertEqual(log.chunk_count, 2, "Each valid row should be its own chunk.")
+        self.assertEqual(log.created_count, 2, "Both valid products should be created.")
+        self.assertEqual(log.error_count, 4, "Error count mismatch.")
+        phases = set(log.phase_ids.mapped('phase'))
+        self.assertEqual(phases, {'decode', 'parse', 'validation', 'deduplication', 'categories', 'lookup', 'writes',
+                                  'error_log'},
+                         "Every import phase should be measured.")
+        self.assertEqual(log.query_count, sum(log.phase_ids.mapped('queries')), "Query count mismatch.")
+
+    def test_preview(self):
+        """Test that the preview reports creates, updates, unchanged rows and new categories without writing."""
+        category = self.category_manager.get_or_create("Valid Category A", "Valid Category A")
+        self.env['product.template'].create({
+            'name': "Sample Product A", 'categ_id': category.id, 'price': 100.0, 'quantity': 10
+        })
+        with open(self.test_file_path, 'rb') as file:
+            wizard = self.env['tech.gear.excel.import.wizard'].create({'file': base64.b64encode(file.read())})
+        product_count = self.env['product.template'].search_count([])
+        category_count = self.env['product.category'].search_count([])
+
+        wizard.action_preview()
+
+        self.assertTrue(wizard.preview_done, "Preview should be marked as done.")
+        self.assertEqual(wizard.preview_create_count, 1, "Sample Product B should be created.")
+        # Like the import, products created or edited outside the importer are updated even with the same values
+        self.assertEqual(wizard.preview_update_count, 1, "Sample Product A should be updated.")
+        self.assertEqual(wizard.preview_unchanged_count, 0, "Nothing should be unchanged.")
+        self.assertEqual(wizard.preview_error_count, 4, "Validation errors should be counted.")
+        self.assertEqual(wizard.preview_new_category_count, 1, "Valid Category B should be new.")
+        self.assertEqual(wizard.preview_new_categories, "Valid Category B", "New category names mismatch.")
+        self.assertEqual(self.env['product.template'].search_count([]), product_count, "Preview created products.")
+        self.assertEqual(self.env['product.category'].search_count([]), category_count,
+                         "Preview created categories.")
+
+        # Once imported, the product is unchanged
+        self.product_manager.batch_update_or_create([ProductData("Sample Product A", "Valid Category A", 100.0, 10, 2)],
+                                                    self.category_manager, [])
+        wizard.action_preview()
+        self.assertEqual(wizard.preview_update_count, 0, "Nothing should be updated.")
+        self.assertEqual(wizard.preview_unchanged_count, 1, "Sample Product A should be unchanged.")
+
+        wizard.skip_unchanged = False
+        wizard.action_preview()
+        self.assertEqual(wizard.preview_update_count, 1, "Without skipping unchanged rows, every product is updated.")
+
+    def test_duplicate_rows(self):
+        """Test that rows repeating a product key are collapsed before importing, following the policy."""
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(("Product Name", "Category", "Price", "Quantity"))
+        for row in [("Duplicate Product", "Duplicate Category", 10.0, 1),
+                    ("Other Product", "Duplicate Category", 5.0, 7),
+                    ("Duplicate Product", "Duplicate Category", 20.0, 2),
+                    ("Duplicate Product", "Duplicate Category", 30.0, 4)]:
+            sheet.append(row)
+        file = BytesIO()
+        workbook.save(file)
+        encoded_file = base64.b64encode(file.getvalue())
+
+        expected = {'first': (10.0, 1), 'last': (30.0, 4), 'sum': (30.0, 7)}
+        for policy, (price, quantity) in expected.items():
+            with self.subTest(policy=policy):
+                wizard = self.env['tech.gear.excel.import.wizard'].create({
+                    'file': encoded_file,
+                    'duplicate_policy': policy,
+                    'skip_unchanged': False,
+                })
+                wizard.import_excel()
+
+                product = self.env['product.template'].search([('name', '=', "Duplicate Product")])
+                self.assertEqual(len(product), 1, "Duplicate rows should not create duplicate products.")
+                self.assertEqual((product.price, product.quantity), (price, quantity), "Merged values mismatch.")
+                self.assertEqual(wizard.import_log_id.duplicate_count, 2, "Collapsed rows should be counted.")
+                self.assertEqual(wizard.import_log_id.created_count + wizard.import_log_id.updated_count, 2,
+                                 "Only one row per product should be written.")
+
     def test_error_logging(self):
         """Test error logging functionality in import_excel method."""
         # Prepare invalid data to trigger errors
@@ -164,6 +727,44 @@ class TestExcelImport(TransactionCase):
         wizard._generate_error_log_file(error_log)
 
         # Decode and read the log file contents
-        log_file_content = base64.b64decode(wizard.error_log_file).decode('utf-8')
+        log_file_content = gzip.decompress(base64.b64decode(wizard.error_log_file)).decode('utf-8')
         self.assertIn("Row 3: Invalid price 'ABC' - must be numeric.", log_file_content)
         self.assertIn("Row 4: Missing 'Product Name' or 'Category'.", log_file_content)
+
+    def test_error_log_aggregation(self):
+        """Test that the error log groups errors by type with counts and sample rows."""
+        error_log = ErrorLog()
+        for row_index in range(2, 30):
+            ProductData("Product", "Category", "ABC", 1, row_index).validate(error_log)
+        ProductData(None, "Category", 1.0, "XYZ", 30).validate(error_log)
+
+        self.assertEqual(len(error_log), 30, "Every error should be counted.")
+        self.assertEqual(error_log.groups['invalid_price']['count'], 28, "Price errors should be grouped.")
+        self.assertEqual(len(error_log.groups['invalid_price']['rows']), ErrorLog.SAMPLE_ROWS,
+                         "Only a sample of rows should be kept per error type.")
+        self.assertEqual(error_log.groups['missing_data']['rows'], [30], "Sample row mismatch.")
+        summary = error_log.summary()
+        self.assertIn("Row 2: Invalid price 'ABC' - must be numeric.", summary)
+        self.assertIn("Row 30: Invalid quantity 'XYZ' - must be numeric.", summary)
+
+        lines = gzip.decompress(error_log.compressed()).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 30, "Every error line should be streamed to the file.")
+        self.assertEqual(lines[-1], "Row 30: Invalid quantity 'XYZ' - must be numeric.", "Line order mismatch.")
+
+    def test_error_limit(self):
+        """Test that reaching the maximum number of errors stops the import early."""
+        error_log = ErrorLog(max_errors=2)
+        ProductData("Product", "Category", "ABC", 1, 2).validate(error_log)
+        with self.assertRaises(ErrorLimitReached):
+            ProductData("Product", "Category", "ABC", 1, 3).validate(error_log)
+
+        with open(self.test_file_path, 'rb') as file:
+            wizard = self.env['tech.gear.excel.import.wizard'].create({
+                'file': base64.b64encode(file.read()),
+                'chunk_size': 1,
+                'max_errors': 1,
+            })
+        wizard.import_excel()
+
+        self.assertIn("Import stopped after reaching the maximum of 1 errors.", wizard.error_summary)
+        self.assertEqual(wizard.import_log_id.error_count, 1, "Errors after the limit should not be collected.")
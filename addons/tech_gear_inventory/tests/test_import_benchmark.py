@@ -0,0 +1,100 @@
+import base64
+import json
+import logging
+import os
+import tempfile
+import tracemalloc
+from odoo.tests import TransactionCase, tagged
+from .workbook_generator import generate_workbook
+
+_logger = logging.getLogger(__name__)
+
+# Sizes can be narrowed down with TECH_GEAR_BENCHMARK_SIZES=1000,10000
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+
+
+@tagged('-standard', 'tech_gear_benchmark')
+class TestImportBenchmark(TransactionCase):
+    # Import benchmarks, excluded from regular test runs. Run them against a throwaway database with:
+    # odoo-bin -d <db> -i tech_gear_inventory --test-tags tech_gear_benchmark --stop-after-init
+    # Every size is imported, then re-imported, through import_excel. The phases report the wall time, SQL
+    # query count and rows recorded by the import statistics, and each run adds its total with the peak Python
+    # memory of the whole run. Results are logged and, when TECH_GEAR_BENCHMARK_OUTPUT is set, appended to
+    # that file as JSON lines.
+
+    def setUp(self):
+        super(TestImportBenchmark, self).setUp()
+        sizes = os.environ.get('TECH_GEAR_BENCHMARK_SIZES')
+        self.sizes = [int(size) for size in sizes.split(',')] if sizes else DEFAULT_SIZES
+        self.duplicate_ratio = float(os.environ.get('TECH_GEAR_BENCHMARK_DUPLICATE_RATIO', 0.05))
+        self.categories = int(os.environ.get('TECH_GEAR_BENCHMARK_CATEGORIES', 200))
+        self.invalid_ratio = float(os.environ.get('TECH_GEAR_BENCHMARK_INVALID_RATIO', 0.01))
+        self.chunk_size = int(os.environ.get('TECH_GEAR_BENCHMARK_CHUNK_SIZE', 1000))
+        self.results = []
+
+    def _run_import(self, rows, run, encoded_file):
+        """Import the file through the wizard and record its phases and totals."""
+        wizard = self.env['tech.gear.excel.import.wizard'].create({
+            'file': encoded_file,
+            'chunk_size': self.chunk_size,
+            'skip_unchanged': False,
+        })
+        self.env.flush_all()
+        tracemalloc.reset_peak()
+        wizard.import_excel()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+
+        log = wizard.import_log_id
+        for phase in log.phase_ids:
+            self.results.append({
+                'rows': rows,
+                'run': run,
+                'phase': phase.phase,
+                'seconds': round(phase.seconds, 3),
+                'queries': phase.queries,
+                'phase_rows': phase.rows,
+            })
+        self.results.append({
+            'rows': rows,
+            'run': run,
+            'phase': 'total',
+            'seconds': round(log.duration, 3),
+            'queries': log.query_count,
+            'phase_rows': log.rows_read,
+            'peak_memory_mb': round(peak_memory / 1024 / 1024, 1),
+        })
+
+    def _generate_file(self, rows):
+        with tempfile.TemporaryFile(suffix='.xlsx') as file:
+            generate_workbook(file, rows, duplicate_ratio=self.duplicate_ratio, categories=self.categories,
+                              invalid_ratio=self.invalid_ratio, prefix=f"Benchmark {rows} ")
+            file.seek(0)
+            return base64.b64encode(file.read())
+
+    def _benchmark(self, rows):
+        encoded_file = self._generate_file(rows)
+        self._run_import(rows, 'import', encoded_file)
+        # Same file again, every valid row is now an update
+        self._run_import(rows, 'reimport', encoded_file)
+
+    def test_import_benchmark(self):
+        """Benchmark import phases on synthetic workbooks of increasing size."""
+        tracemalloc.start()
+        try:
+            for rows in self.sizes:
+                self._benchmark(rows)
+        finally:
+            tracemalloc.stop()
+
+        for result in self.results:
+            if result['phase'] == 'total':
+                _logger.info("Import benchmark: %(rows)d rows, %(run)s: %(seconds).3fs, %(queries)d queries, "
+                             "%(peak_memory_mb).1f MB peak", result)
+            else:
+                _logger.info("Import benchmark: %(rows)d rows, %(run)s, %(phase)s: %(seconds).3fs, "
+                             "%(queries)d queries, %(phase_rows)d rows", result)
+        output = os.environ.get('TECH_GEAR_BENCHMARK_OUTPUT')
+        if output:
+            with open(output, 'a') as file:
+                for result in self.results:
+                    file.write(json.dumps(result) + "\n")
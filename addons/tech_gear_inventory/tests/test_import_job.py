@@ -0,0 +1,134 @@
+import base64
+import os
+from io import BytesIO
+from unittest.mock import patch
+import openpyxl
+from odoo.tests import TransactionCase
+
+
+class TestImportJob(TransactionCase):
+    def setUp(self):
+        """Set up a background import job for the sample test file."""
+        super(TestImportJob, self).setUp()
+        test_dir = os.path.dirname(os.path.abspath(__file__))
+        with open(os.path.join(test_dir, 'test_data.xlsx'), 'rb') as file:
+            self.encoded_file = base64.b64encode(file.read())
+        self.job = self.env['tech.gear.import.job'].create({
+            'file': self.encoded_file,
+            'chunk_size': 1,
+        })
+
+    def test_process_job(self):
+        """Test that a job imports the file and records its progress and errors."""
+        self.job._process()
+
+        self.assertEqual(self.job.state, 'done', "Job should be done.")
+        self.assertTrue(self.env['product.template'].search([('name', '=', 'Sample Product A')]),
+                        "Sample Product A import failed.")
+        self.assertTrue(self.env['product.template'].search([('name', '=', 'Sample Product B')]),
+                        "Sample Product B import failed.")
+        self.assertEqual(self.job.rows_done, 4, "All data rows should be processed.")
+        self.assertEqual(self.job.last_row_index, 5, "Last committed row mismatch.")
+        self.assertEqual(self.job.error_count, 4, f"Unexpected errors found: {self.job.error_summary}")
+        self.assertIn("Row 4: Missing 'Product Name' or 'Category'.", self.job.error_summary)
+        self.assertEqual(self.job.error_groups['missing_data']['count'], 2, "Missing data errors should be grouped.")
+        self.assertTrue(self.job.error_log_file, "Error log file should be generated.")
+        self.assertEqual(len(self.job.import_log_ids), 1, "Each run should record its statistics.")
+        self.assertEqual(self.job.import_log_ids.rows_read, 4, "Run statistics should count all data rows.")
+
+    def test_resume_job(self):
+        """Test that an interrupted job resumes after its last committed row."""
+        self.job.write({'state': 'running', 'last_row_index': 2, 'rows_done': 1})
+
+        self.job._process()
+
+        self.assertEqual(self.job.state, 'done', "Job should be done.")
+        self.assertFalse(self.env['product.template'].search([('name', '=', 'Sample Product A')]),
+                         "Rows before the last committed row should not be imported again.")
+        self.assertTrue(self.env['product.template'].search([('name', '=', 'Sample Product B')]),
+                        "Sample Product B import failed.")
+        self.assertEqual(self.job.rows_done, 4, "All data rows should be counted once.")
+
+    def test_error_limit_job(self):
+        """Test that a job stopped by the error limit fails and cannot be resumed into the same errors."""
+        self.job.max_errors = 1
+
+        self.job._process()
+
+        self.assertEqual(self.job.state, 'failed', "Job should fail at the error limit.")
+        self.assertTrue(self.job.error_limit_reached, "Job should record that it hit the error limit.")
+        self.job.action_resume()
+        self.assertEqual(self.job.state, 'failed', "Jobs stopped by the error limit should not be resumed.")
+
+    def test_resume_job_duplicate_rows(self):
+        """Test that a resumed job collapses duplicates over the whole file, including committed rows."""
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(("Product Name", "Category", "Price", "Quantity"))
+        for row in [("Duplicate Product", "Duplicate Category", 10.0, 1),
+                    ("Other Product", "Duplicate Category", 5.0, 7),
+                    ("Duplicate Product", "Duplicate Category", 20.0, 2),
+                    ("Duplicate Product", "Duplicate Category", 30.0, 4)]:
+            sheet.append(row)
+        file = BytesIO()
+        workbook.save(file)
+        encoded_file = base64.b64encode(file.getvalue())
+        category = self.env['product.category'].create({'name': "Duplicate Category"})
+
+        # The first run committed rows 2 and 3: the first occurrence for 'first', only row 3 otherwise
+        expected = {'first': (10.0, 1), 'sum': (30.0, 7)}
+        for policy, (price, quantity) in expected.items():
+            with self.subTest(policy=policy):
+                self.env['product.template'].search([('name', '=', "Duplicate Product")]).unlink()
+                if policy == 'first':
+                    self.env['product.template'].create({'name': "Duplicate Product", 'categ_id': category.id,
+                                                         'price': 10.0, 'quantity': 1})
+                job = self.env['tech.gear.import.job'].create({
+                    'file': encoded_file,
+                    'duplicate_policy': policy,
+                    'skip_unchanged': False,
+                    'state': 'running',
+                    'last_row_index': 3,
+                    'rows_done': 2,
+                })
+
+                job._process()
+
+                product = self.env['product.template'].search([('name', '=', "Duplicate Product")])
+                self.assertEqual(len(product), 1, "Duplicate rows should not create duplicate products.")
+                self.assertEqual((product.price, product.quantity), (price, quantity), "Merged values mismatch.")
+                self.assertEqual(job.rows_done, 4, "All data rows should be counted once.")
+
+    def test_wizard_queues_job(self):
+        """Test that the wizard queues a background job with its file and chunk size."""
+        wizard = self.env['tech.gear.excel.import.wizard'].create({
+            'file': self.encoded_file,
+            'chunk_size': 7,
+        })
+
+        action = wizard.import_excel_background()
+
+        job = self.env['tech.gear.import.job'].browse(action['res_id'])
+        self.assertEqual(job.state, 'pending', "Queued job should be pending.")
+        self.assertEqual(job.chunk_size, 7, "Chunk size should be copied from the wizard.")
+        self.assertEqual(job._get_file_attachment().checksum, wizard._get_file_attachment().checksum,
+                         "The stored file should be shared with the job.")
+        self.assertEqual(job.file, self.encoded_file, "File should be copied from the wizard.")
+
+    def test_cron_runs_jobs_as_requester(self):
+        """Test that the cron processes each job as the user who queued it."""
+        user = self.env['res.users'].create({
+            'name': "Import Requester",
+            'login': 'tech_gear_import_requester',
+            'groups_id': [(6, 0, [self.env.ref('base.group_user').id])],
+        })
+        job = self.env['tech.gear.import.job'].with_user(user).create({'file': self.encoded_file})
+        processing_users = {}
+
+        def process(job, auto_commit=False):
+            processing_users[job.id] = job.env.user
+
+        with patch.object(type(self.env['tech.gear.import.job']), '_process', process):
+            self.env['tech.gear.import.job']._cron_process_jobs()
+
+        self.assertEqual(processing_users[job.id], user, "Job should be processed as its requester.")
@@ -0,0 +1,61 @@
+import argparse
+import random
+import openpyxl
+
+HEADER = ('Product Name', 'Category', 'Price', 'Quantity')
+
+
+def generate_workbook(path, rows, duplicate_ratio=0.0, categories=100, invalid_ratio=0.0, seed=0, prefix=''):
+    """
+    Write a synthetic product sheet in the importer's layout, streaming rows so large sheets use flat memory.
+    :param path: Path or file object the workbook is saved to
+    :param rows: Number of data rows, the header is not counted
+    :param duplicate_ratio: Share of rows repeating the (name, category) key of an earlier row
+    :param categories: Number of distinct categories
+    :param invalid_ratio: Share of rows with a missing name, a non-numeric price or a non-numeric quantity
+    :param seed: Seed of the random generator, the same arguments always produce the same sheet
+    :param prefix: Prefix of product and category names, keeps several generated sheets apart
+    """
+    generator = random.Random(seed)
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Products")
+    sheet.append(HEADER)
+
+    # Products are numbered, the category is derived from the number so duplicates need no key history
+    products = 0
+    for _index in range(rows):
+        if products and generator.random() < duplicate_ratio:
+            product = generator.randrange(products)
+        else:
+            product = products
+            products += 1
+        name = f"{prefix}Product {product}"
+        category = f"{prefix}Category {product * 2654435761 % categories}"
+        price = round(generator.uniform(1, 1000), 2)
+        quantity = generator.randrange(1000)
+
+        if generator.random() < invalid_ratio:
+            defect = generator.randrange(3)
+            if defect == 0:
+                name = None
+            elif defect == 1:
+                price = "N/A"
+            else:
+                quantity = "many"
+        sheet.append((name, category, price, quantity))
+
+    workbook.save(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a synthetic product sheet for import benchmarks.")
+    parser.add_argument('path', help="Output .xlsx file")
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--duplicate-ratio', type=float, default=0.0)
+    parser.add_argument('--categories', type=int, default=100)
+    parser.add_argument('--invalid-ratio', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--prefix', default='')
+    args = parser.parse_args()
+    generate_workbook(args.path, args.rows, args.duplicate_ratio, args.categories, args.invalid_ratio, args.seed,
+                      args.prefix)